@@ -0,0 +1,125 @@
+"""
+Grid world for the model based vacuum agent
+
+REFLEX_AGENT_WITH_STATE on an N x M grid instead of the four rooms A - D.
+The agent's model is a bit array of the cells it knows are clean, and when
+its own cell is clean it walks to the nearest cell it has not seen yet,
+found by a breadth-first frontier that stops at the first unknown cell.
+"""
+import random
+import time
+from collections import deque
+
+MOVES = {'Up': (-1, 0), 'Down': (1, 0), 'Left': (0, -1), 'Right': (0, 1)}
+
+
+class GridWorld:  # Environment: dirt per cell and the agent's current cell
+    def __init__(self, rows, cols, dirt_probability=0.5, seed=None):
+        rng = random.Random(seed)
+        self.ROWS = rows
+        self.COLS = cols
+        self.dirt = bytearray(rng.random() < dirt_probability for i in range(rows * cols))
+        self.dirty = sum(self.dirt)
+        self.location = rng.randrange(rows * cols)
+
+    def Sensors(self):
+        return self.location, 'Dirty' if self.dirt[self.location] else 'Clean'
+
+    def Actuators(self, action):
+        if action == 'Suck':
+            if self.dirt[self.location]:
+                self.dirt[self.location] = 0
+                self.dirty -= 1
+        elif action in MOVES:
+            row, col = divmod(self.location, self.COLS)
+            d_row, d_col = MOVES[action]
+            if 0 <= row + d_row < self.ROWS and 0 <= col + d_col < self.COLS:
+                self.location = (row + d_row) * self.COLS + col + d_col
+
+
+class GridReflexAgentWithState:  # REFLEX_AGENT_WITH_STATE for a rows x cols grid
+    def __init__(self, rows, cols):
+        self.ROWS = rows
+        self.COLS = cols
+        self.model = bytearray((rows * cols + 7) // 8)  # bit set = cell known clean
+        self.plan = []  # moves left to reach the next unknown cell
+
+    def known_clean(self, cell):
+        return self.model[cell >> 3] & (1 << (cell & 7))
+
+    def UPDATE_STATE(self, percept):
+        (location, status) = percept
+        if status == 'Clean':
+            self.model[location >> 3] |= 1 << (location & 7)
+        else:
+            self.model[location >> 3] &= ~(1 << (location & 7))
+
+    def neighbours(self, cell):
+        row, col = divmod(cell, self.COLS)
+        if row > 0:
+            yield 'Up', cell - self.COLS
+        if row < self.ROWS - 1:
+            yield 'Down', cell + self.COLS
+        if col > 0:
+            yield 'Left', cell - 1
+        if col < self.COLS - 1:
+            yield 'Right', cell + 1
+
+    def FRONTIER_PLAN(self, start):
+        '''
+        Breadth-first search from start to the nearest cell not known to be
+        clean. Return the list of moves to get there, or [] if every cell is
+        known clean.
+        '''
+        parent = {start: None}
+        frontier = deque([start])
+        while frontier:
+            cell = frontier.popleft()
+            for action, neighbour in self.neighbours(cell):
+                if neighbour in parent:
+                    continue
+                parent[neighbour] = (cell, action)
+                if not self.known_clean(neighbour):
+                    plan = []
+                    while parent[neighbour] is not None:
+                        neighbour, action = parent[neighbour]
+                        plan.append(action)
+                    return plan  # reversed, so plan.pop() gives the next move
+                frontier.append(neighbour)
+        return []
+
+    def __call__(self, percept):
+        self.UPDATE_STATE(percept)
+        if percept[1] == 'Dirty':
+            return 'Suck'
+        if not self.plan:
+            self.plan = self.FRONTIER_PLAN(percept[0])
+            if not self.plan:
+                return 'NoOp'
+        return self.plan.pop()
+
+
+def run_headless(rows, cols, seed=0):
+    '''
+    Run the agent until the grid is clean without printing every step.
+    Return (steps to clean, wall time in seconds).
+    '''
+    world = GridWorld(rows, cols, seed=seed)
+    agent = GridReflexAgentWithState(rows, cols)
+    steps = 0
+    start = time.perf_counter()
+    while world.dirty:
+        world.Actuators(agent(world.Sensors()))
+        steps += 1
+    return steps, time.perf_counter() - start
+
+
+def run(sizes=((4, 4), (32, 32), (100, 100), (300, 300))):
+    print('{:>10s}{:>10s}{:>12s}{:>10s}'.format('grid', 'cells', 'steps', 'seconds'))
+    for rows, cols in sizes:
+        steps, seconds = run_headless(rows, cols)
+        print('{:>10s}{:>10d}{:>12d}{:>10.3f}'.format('{}x{}'.format(rows, cols), rows * cols, steps, seconds))
+
+
+if __name__ == '__main__':
+    run()
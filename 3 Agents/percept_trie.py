@@ -0,0 +1,119 @@
+"""
+Prefix trie for the table driven agent
+
+TABLE_DRIVEN_AGENT keeps every percept in a global list and looks up
+tuple(percepts) on every step, which costs O(t) at step t. Here the table is
+stored as a trie of percepts, shared prefixes are stored once, and each agent
+keeps a cursor into the trie that advances one percept per step.
+
+Table file format, one entry per line, percepts separated by ';':
+    A,Clean;A,Dirty    Suck
+"""
+import os
+import tempfile
+import time
+
+from table_driven_agent import A, B, LOOKUP, table
+
+
+class TrieNode:  # One percept sequence; ACTION is None if the table has no entry for it
+    __slots__ = ('CHILDREN', 'ACTION')
+
+    def __init__(self):
+        self.CHILDREN = {}
+        self.ACTION = None
+
+
+DEAD_END = TrieNode()  # Cursor position once no table entry starts with the percepts seen
+
+
+def INSERT(root, percepts, action):  # Add one table entry to the trie
+    node = root
+    for percept in percepts:
+        child = node.CHILDREN.get(percept)
+        if child is None:
+            child = node.CHILDREN[percept] = TrieNode()
+        node = child
+    node.ACTION = action
+
+
+def BUILD_TRIE(table):  # Build a trie from a {percept sequence: action} table
+    root = TrieNode()
+    for percepts, action in table.items():
+        INSERT(root, percepts, action)
+    return root
+
+
+def LOAD_TRIE(path):
+    '''
+    Stream a table file into a trie, one line at a time, so the table never
+    has to exist as a dict of tuples.
+    '''
+    root = TrieNode()
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            sequence, action = line.rsplit(None, 1)
+            INSERT(root, [tuple(percept.split(',')) for percept in sequence.split(';')], action)
+    return root
+
+
+def SAVE_TABLE(table, path):  # Write a {percept sequence: action} table in the file format
+    with open(path, 'w') as f:
+        for percepts, action in table.items():
+            f.write('{}\t{}\n'.format(';'.join(','.join(percept) for percept in percepts), action))
+
+
+class TableDrivenAgent:  # TABLE_DRIVEN_AGENT with its own cursor instead of the global percepts list
+    def __init__(self, root):
+        self.ROOT = root
+        self.cursor = root
+
+    def __call__(self, percept):
+        self.cursor = self.cursor.CHILDREN.get(percept, DEAD_END)
+        return self.cursor.ACTION
+
+    def reset(self):
+        self.cursor = self.ROOT
+
+
+def chain_table(n):  # Table whose entries are all prefixes of one n step percept history
+    history = [(A, 'Clean') if i % 2 else (B, 'Dirty') for i in range(n)]
+    return history, {tuple(history[:i + 1]): 'Right' if i % 2 else 'Suck' for i in range(n)}
+
+
+def run(n=3000, agents=1000):
+    print('Action \tPercepts')
+    agent = TableDrivenAgent(BUILD_TRIE(table))
+    percepts = []
+    for percept in [(A, 'Clean'), (A, 'Dirty'), (B, 'Clean')]:
+        percepts.append(percept)
+        print(agent(percept), '\t', percepts)
+
+    history, long_table = chain_table(n)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'table.txt')
+        SAVE_TABLE(long_table, path)
+        start = time.perf_counter()
+        root = LOAD_TRIE(path)
+        print('\nLoaded {} entries from file in {:.3f}s'.format(len(long_table), time.perf_counter() - start))
+
+    start = time.perf_counter()
+    percepts = []
+    for percept in history:
+        percepts.append(percept)
+        LOOKUP(percepts, long_table)
+    print('LOOKUP(tuple(percepts)): {} steps in {:.3f}s'.format(n, time.perf_counter() - start))
+
+    start = time.perf_counter()
+    many = [TableDrivenAgent(root) for i in range(agents)]
+    for percept in history:
+        for agent in many:
+            agent(percept)
+    print('trie cursor: {} agents x {} steps in {:.3f}s'.format(agents, n, time.perf_counter() - start))
+
+
+if __name__ == '__main__':
+    run()
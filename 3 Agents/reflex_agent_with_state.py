@@ -94,4 +94,6 @@ def run(n):
         (location, status) = Sensors()
         print("{:8s}{:12s}{:8s}".format(action, location, status))
 
-run(20)
\ No newline at end of file
+
+if __name__ == '__main__':
+    run(20)
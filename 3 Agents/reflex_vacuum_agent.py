@@ -25,23 +25,23 @@ def REFLEX_VACUUM_AGENT(loc_st):
         return 'Left'
 
 
-def Sensors():
-    location = Environment['Current']
-    return location, Environment[location]
+def Sensors(environment=Environment):
+    location = environment['Current']
+    return location, environment[location]
 
 
-def Actuators(action):
-    location = Environment['Current']
+def Actuators(action, environment=Environment):
+    location = environment['Current']
     if action == 'Suck':
-        Environment[location] = 'Clean'
+        environment[location] = 'Clean'
     elif action == 'Right' and location == A:
-        Environment['Current'] = B
+        environment['Current'] = B
     elif action == 'Down' and location == B:
-        Environment['Current'] = D
+        environment['Current'] = D
     elif action == 'Left' and location == D:
-        Environment['Current'] = C
+        environment['Current'] = C
     elif action == 'Up' and location == C:
-        Environment['Current'] = A
+        environment['Current'] = A
 
 
 def run(n, make_agent):
@@ -56,4 +56,5 @@ def run(n, make_agent):
         print("{:8s}{:12s}{:8s}".format(action, location, status))
 
 
-run(20, REFLEX_VACUUM_AGENT)
\ No newline at end of file
+if __name__ == '__main__':
+    run(20, REFLEX_VACUUM_AGENT)
@@ -0,0 +1,138 @@
+"""
+Rule compiler for the reflex agents
+
+Interns locations and statuses as small ints and flattens a `rules` dict into
+a dense array indexed by the encoded percept, so RULE_MATCH becomes a single
+array lookup instead of building and hashing a tuple on every step.
+
+The dict based RULE_MATCH in the agent scripts stays the reference mode;
+run() checks both modes agree and times them against each other.
+"""
+import random
+import time
+from array import array
+
+import reflex_agent_with_state
+import simple_reflex_agent
+
+
+class CompiledRules:  # Dense rule table indexed by an encoded percept/state
+    def __init__(self, rules, rule_action, locations, statuses=('Clean', 'Dirty')):
+        self.LOCATIONS = {location: i for i, location in enumerate(locations)}
+        self.STATUSES = {status: i for i, status in enumerate(statuses)}
+        self.PERCEPTS = {(location, status): self.LOCATIONS[location] * len(statuses) + self.STATUSES[status]
+                         for location in locations for status in statuses}
+        self.ACTIONS = tuple(rule_action.values())
+        action_index = {rule: i for i, rule in enumerate(rule_action)}
+
+        # Codes 0 .. len(locations) * len(statuses) - 1 are the percepts,
+        # any other rule key (e.g. (A, B, C, D, 'Clean')) gets a code after them
+        self.EXTRA_STATES = {}
+        for state in rules:
+            if state in self.PERCEPTS:
+                continue
+            self.EXTRA_STATES[state] = len(self.LOCATIONS) * len(self.STATUSES) + len(self.EXTRA_STATES)
+
+        self.TABLE = array('B', [0] * (len(self.LOCATIONS) * len(self.STATUSES) + len(self.EXTRA_STATES)))
+        matched = set()
+        for state, rule in rules.items():
+            if rule not in action_index:
+                raise ValueError('Rule {} for state {} has no entry in RULE_ACTION'.format(rule, state))
+            code = self.encode(state)
+            self.TABLE[code] = action_index[rule]
+            matched.add(code)
+
+        unmatched = [(location, status) for location in locations for status in statuses
+                     if self.encode((location, status)) not in matched]
+        if unmatched:
+            raise ValueError('No rule matches percepts {}'.format(unmatched))
+
+    def encode(self, state):  # (location, status) or an extra state -> int code
+        code = self.PERCEPTS.get(state)
+        if code is None:
+            return self.EXTRA_STATES[tuple(state)]
+        return code
+
+    def RULE_ACTION(self, code):  # Action for an encoded state
+        return self.ACTIONS[self.TABLE[code]]
+
+
+SIMPLE_RULES = CompiledRules(simple_reflex_agent.rules, simple_reflex_agent.RULE_ACTION,
+                             (simple_reflex_agent.A, simple_reflex_agent.B))
+
+
+def COMPILED_SIMPLE_REFLEX_AGENT(percept):  # Compiled mode of SIMPE_REFLEX_AGENT
+    return SIMPLE_RULES.ACTIONS[SIMPLE_RULES.TABLE[SIMPLE_RULES.PERCEPTS[percept]]]
+
+
+class CompiledReflexAgentWithState:  # Compiled mode of REFLEX_AGENT_WITH_STATE
+    def __init__(self, compiled_rules):
+        rules = compiled_rules
+        self.PERCEPTS = rules.PERCEPTS
+        self.TABLE = rules.TABLE
+        self.ACTIONS = rules.ACTIONS
+        self.ALL_CLEAN_CODE = rules.encode(tuple(rules.LOCATIONS) + ('Clean',))
+        self.ALL_CLEAN = (1 << len(rules.LOCATIONS)) - 1
+        self.clean = 0  # model as a bitmask of rooms last seen clean
+
+        # Per percept code: bits to set and bits to keep in the model
+        self.SET = [0] * len(rules.PERCEPTS)
+        self.KEEP = [self.ALL_CLEAN] * len(rules.PERCEPTS)
+        for (location, status), code in rules.PERCEPTS.items():
+            bit = 1 << rules.LOCATIONS[location]
+            if status == 'Clean':
+                self.SET[code] = bit
+            else:
+                self.KEEP[code] = self.ALL_CLEAN & ~bit
+
+    def __call__(self, percept):
+        code = self.PERCEPTS[percept]
+        # Same order as UPDATE_STATE: look at the model before recording this percept
+        rule_code = self.ALL_CLEAN_CODE if self.clean == self.ALL_CLEAN else code
+        self.clean = (self.clean | self.SET[code]) & self.KEEP[code]
+        return self.ACTIONS[self.TABLE[rule_code]]
+
+
+STATE_RULES = CompiledRules(reflex_agent_with_state.rules, reflex_agent_with_state.RULE_ACTION,
+                            (reflex_agent_with_state.A, reflex_agent_with_state.B,
+                             reflex_agent_with_state.C, reflex_agent_with_state.D))
+
+
+def benchmark(name, reference, compiled, percepts, inputs=None):
+    '''
+    Time the reference agent over the percepts and the compiled agent over
+    inputs (the same percepts unless given pre-encoded), and check they agree.
+    '''
+    if inputs is None:
+        inputs = percepts
+    start = time.perf_counter()
+    expected = [reference(percept) for percept in percepts]
+    reference_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    actions = [compiled(x) for x in inputs]
+    compiled_time = time.perf_counter() - start
+
+    assert actions == expected, 'compiled mode disagrees with the dict rules'
+    print('{:26s} dict: {:.3f}s  compiled: {:.3f}s  ({:.2f}x)'.format(
+        name, reference_time, compiled_time, reference_time / compiled_time))
+
+
+def run(n=200000):
+    rng = random.Random(0)
+    simple_percepts = [(rng.choice('AB'), rng.choice(('Clean', 'Dirty'))) for i in range(n)]
+    state_percepts = [(rng.choice('ABCD'), rng.choice(('Clean', 'Clean', 'Clean', 'Dirty'))) for i in range(n)]
+
+    benchmark('SIMPE_REFLEX_AGENT', simple_reflex_agent.SIMPE_REFLEX_AGENT,
+              COMPILED_SIMPLE_REFLEX_AGENT, simple_percepts)
+    benchmark('REFLEX_AGENT_WITH_STATE', reflex_agent_with_state.REFLEX_AGENT_WITH_STATE,
+              CompiledReflexAgentWithState(STATE_RULES), state_percepts)
+
+    # With percepts already encoded (e.g. from vacuum_batch) only the array lookup is left
+    codes = [SIMPLE_RULES.encode(percept) for percept in simple_percepts]
+    benchmark('pre-encoded percepts', simple_reflex_agent.SIMPE_REFLEX_AGENT,
+              SIMPLE_RULES.RULE_ACTION, simple_percepts, codes)
+
+
+if __name__ == '__main__':
+    run()
@@ -33,18 +33,18 @@ def SIMPE_REFLEX_AGENT(percept): # Determine action
     rule = RULE_MATCH(state, rules)
     return RULE_ACTION[rule]
 
-def Sensors(): # Sense Environment
-    location = Environment['Current']
-    return (location, Environment[location])
+def Sensors(environment=Environment): # Sense Environment
+    location = environment['Current']
+    return (location, environment[location])
 
-def Actuators(action): # Modify Environment
-    location = Environment['Current']
+def Actuators(action, environment=Environment): # Modify Environment
+    location = environment['Current']
     if action == 'Suck':
-        Environment[location] = 'Clean'
+        environment[location] = 'Clean'
     elif action == 'Right' and location == A:
-        Environment['Current'] = B
+        environment['Current'] = B
     elif action == 'Left' and location == B:
-        Environment['Current'] = A
+        environment['Current'] = A
 
 def run(n): # run the agent through n steps
     print('Current New')
@@ -57,4 +57,6 @@ def run(n): # run the agent through n steps
         (location, status) = Sensors() # Sense Environment after action
         print('{:8s}{:12s}{:8s}'.format(action, location, status))
 
-run(10)
\ No newline at end of file
+
+if __name__ == '__main__':
+    run(10)
@@ -0,0 +1,85 @@
+"""
+Concurrent simulation runner for the vacuum agents
+
+Runs many agent/world episodes on a process (or thread) pool. Every episode
+works on its own copy of the environment dict and returns an EpisodeResult
+record instead of printing each step, so parameter sweeps over agent
+programs and start worlds can use every core.
+"""
+import itertools
+import time
+from collections import Counter, namedtuple
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import reflex_vacuum_agent
+import simple_reflex_agent
+
+EpisodeResult = namedtuple('EpisodeResult', ['agent', 'start', 'steps', 'actions', 'cleaned'])
+
+# Agent programs by name, with the script whose Sensors/Actuators define their world
+AGENTS = {
+    'REFLEX_VACUUM_AGENT': (reflex_vacuum_agent.REFLEX_VACUUM_AGENT, reflex_vacuum_agent),
+    'SIMPE_REFLEX_AGENT': (simple_reflex_agent.SIMPE_REFLEX_AGENT, simple_reflex_agent),
+}
+
+
+def RUN_EPISODE(job):
+    '''
+    Run one episode for job = (agent name, start environment, n).
+    Stops after n steps or as soon as every room is clean.
+    '''
+    name, start, n = job
+    agent, world = AGENTS[name]
+    environment = dict(start)
+    rooms = [room for room in environment if room != 'Current']
+    actions = Counter()
+    steps = 0
+    while steps < n and any(environment[room] == 'Dirty' for room in rooms):
+        action = agent(world.Sensors(environment))
+        world.Actuators(action, environment)
+        actions[action] += 1
+        steps += 1
+    cleaned = tuple(room for room in rooms if start[room] == 'Dirty' and environment[room] == 'Clean')
+    return EpisodeResult(name, start, steps, dict(actions), cleaned)
+
+
+def RUN_SWEEP(jobs, workers=None, processes=True, chunksize=64):
+    '''
+    Run every job on a pool and return the EpisodeResults in job order.
+    Processes avoid the GIL; threads skip the pickling overhead.
+    '''
+    executor = ProcessPoolExecutor if processes else ThreadPoolExecutor
+    with executor(max_workers=workers) as pool:
+        return list(pool.map(RUN_EPISODE, jobs, chunksize=chunksize))
+
+
+def START_WORLDS(rooms):  # Every start location with every combination of dirty rooms
+    for current in rooms:
+        for statuses in itertools.product(('Clean', 'Dirty'), repeat=len(rooms)):
+            environment = dict(zip(rooms, statuses))
+            environment['Current'] = current
+            yield environment
+
+
+def run(repeat=200, n=20):
+    jobs = []
+    for name, (agent, world) in AGENTS.items():
+        rooms = [room for room in world.Environment if room != 'Current']
+        jobs.extend((name, start, n) for start in START_WORLDS(rooms))
+    jobs = jobs * repeat
+
+    for processes in (False, True):
+        start = time.perf_counter()
+        results = RUN_SWEEP(jobs, processes=processes)
+        print('{} pool: {} episodes in {:.3f}s'.format(
+            'process' if processes else 'thread', len(results), time.perf_counter() - start))
+
+    for name in AGENTS:
+        episodes = [result for result in results if result.agent == name]
+        print('{:20s} mean steps: {:.2f}  max steps: {}  rooms cleaned: {}'.format(
+            name, sum(result.steps for result in episodes) / len(episodes),
+            max(result.steps for result in episodes), sum(len(result.cleaned) for result in episodes)))
+
+
+if __name__ == '__main__':
+    run()
@@ -31,4 +31,5 @@ def run():
     print(TABLE_DRIVEN_AGENT((B, 'Clean')), '\t', percepts)
 
 
-run()
\ No newline at end of file
+if __name__ == '__main__':
+    run()
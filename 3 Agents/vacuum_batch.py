@@ -0,0 +1,117 @@
+"""
+Batch vacuum world simulator
+
+Holds thousands of vacuum worlds as NumPy arrays and steps all of them at
+once. Each world is a location index plus a dirt bitmask (bit i is set while
+room i is dirty), so there is no global Environment dict to mutate.
+
+Reflex agent programs are compiled to a lookup array indexed by the percept,
+which lets every environment pick its action with one fancy-indexing call.
+"""
+import time
+
+import numpy as np
+
+from reflex_vacuum_agent import REFLEX_VACUUM_AGENT
+from simple_reflex_agent import SIMPE_REFLEX_AGENT
+
+A = 'A'
+B = 'B'
+C = 'C'
+D = 'D'
+
+ACTIONS = ('NoOp', 'Suck', 'Right', 'Left', 'Down', 'Up')
+STATUSES = ('Clean', 'Dirty')  # index is the dirt bit
+SUCK = ACTIONS.index('Suck')
+
+# Moves handled by Actuators() in the agent scripts, as {(action, room): new room}
+TWO_ROOMS = ((A, B), {('Right', A): B,
+                      ('Left', B): A})
+FOUR_ROOMS = ((A, B, C, D), {('Right', A): B,
+                             ('Down', B): D,
+                             ('Left', D): C,
+                             ('Up', C): A})
+
+
+def COMPILE_WORLD(rooms, moves):
+    '''
+    Build the transition table next_location[action, location].
+    Moves missing from the dict leave the agent where it is, just like
+    Actuators() ignores 'Right' in room B.
+    '''
+    index = {room: i for i, room in enumerate(rooms)}
+    table = np.tile(np.arange(len(rooms), dtype=np.intp), (len(ACTIONS), 1))
+    for (action, room), new_room in moves.items():
+        table[ACTIONS.index(action), index[room]] = index[new_room]
+    return table
+
+
+def COMPILE_AGENT(agent, rooms):
+    '''
+    Ask the agent program once for every percept (room, status) and store the
+    answers in an array indexed by 2 * location + dirty.
+    Only valid for reflex agents, whose action depends on the percept alone.
+    '''
+    table = np.zeros(2 * len(rooms), dtype=np.intp)
+    for location, room in enumerate(rooms):
+        for dirty, status in enumerate(STATUSES):
+            action = agent((room, status))
+            if action not in ACTIONS:
+                raise ValueError('Agent returned {!r} for percept {}'.format(action, (room, status)))
+            table[2 * location + dirty] = ACTIONS.index(action)
+    return table
+
+
+class VacuumBatch:  # Many vacuum worlds over the same rooms, stepped together
+    def __init__(self, world, locations, dirt):
+        rooms, moves = world
+        self.ROOMS = rooms
+        self.NEXT_LOCATION = COMPILE_WORLD(rooms, moves)
+        self.location = np.asarray(locations, dtype=np.intp)
+        self.dirt = np.asarray(dirt, dtype=np.int64)
+
+    @classmethod
+    def random(cls, world, n, seed=None):
+        '''
+        Create n environments with random start rooms and random dirt.
+        '''
+        rng = np.random.default_rng(seed)
+        rooms = len(world[0])
+        return cls(world, rng.integers(0, rooms, n), rng.integers(0, 1 << rooms, n))
+
+    def Sensors(self):  # Percept index 2 * location + dirty for every environment
+        return 2 * self.location + ((self.dirt >> self.location) & 1)
+
+    def Actuators(self, actions):  # Apply one action per environment
+        suck = (actions == SUCK).astype(np.int64)
+        self.dirt &= ~(suck << self.location)
+        self.location = self.NEXT_LOCATION[actions, self.location]
+
+    def run(self, agent_table, n):
+        '''
+        Run every environment for n steps.
+        Return the step at which each environment became clean (-1 if never).
+        '''
+        clean_at = np.where(self.dirt == 0, 0, -1)
+        for step in range(1, n + 1):
+            self.Actuators(agent_table[self.Sensors()])
+            clean_at[(clean_at < 0) & (self.dirt == 0)] = step
+        return clean_at
+
+
+def run(n=10000, steps=1000):
+    for name, world, agent in [('SIMPE_REFLEX_AGENT', TWO_ROOMS, SIMPE_REFLEX_AGENT),
+                               ('REFLEX_VACUUM_AGENT', FOUR_ROOMS, REFLEX_VACUUM_AGENT)]:
+        table = COMPILE_AGENT(agent, world[0])
+        batch = VacuumBatch.random(world, n, seed=0)
+        start = time.perf_counter()
+        clean_at = batch.run(table, steps)
+        elapsed = time.perf_counter() - start
+        print('{}: {} worlds x {} steps in {:.3f}s ({:,.0f} agent-steps/s)'.format(
+            name, n, steps, elapsed, n * steps / elapsed))
+        print('  worlds cleaned: {}  mean steps to clean: {:.2f}'.format(
+            np.count_nonzero(clean_at >= 0), clean_at[clean_at >= 0].mean()))
+
+
+if __name__ == '__main__':
+    run()
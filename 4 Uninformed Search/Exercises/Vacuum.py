@@ -1,3 +1,10 @@
+import json
+from collections import deque
+from heapq import heappop, heappush
+from itertools import count
+from time import perf_counter
+
+
 class Node:  # Node has only PARENT_NODE, STATE, DEPTH
     def __init__(self, state, parent=None, depth=0):
         self.STATE = state
@@ -19,21 +26,136 @@ class Node:  # Node has only PARENT_NODE, STATE, DEPTH
         return 'State: ' + str(self.STATE) + ' - Depth: ' + str(self.DEPTH)
 
 
+class FifoFrontier(deque):  # Breadth-first: pop() returns the oldest node in O(1)
+    def pop(self):
+        return self.popleft()
+
+
+class LifoFrontier(list):  # Depth-first: pop() returns the newest node in O(1)
+    pass
+
+
+class PriorityFrontier:  # pop() returns the node with the lowest priority_fn(node) in O(log n)
+    def __init__(self, priority_fn):
+        self.priority_fn = priority_fn
+        self.heap = []
+        self.counter = count()  # ties are popped in insertion order
+
+    def append(self, node):
+        heappush(self.heap, (self.priority_fn(node), next(self.counter), node))
+
+    def extend(self, nodes):
+        for node in nodes:
+            self.append(node)
+
+    def pop(self):
+        return heappop(self.heap)[2]
+
+    def __len__(self):
+        return len(self.heap)
+
+    def __repr__(self):
+        return repr([node for (priority, order, node) in sorted(self.heap)])
+
+
+class SearchStats:  # Search observer: counters, time per phase and sampled tracing
+    def __init__(self, trace=0, sample=1):
+        self.trace = trace  # 0 silent, 1 print counters, 2 also print the fringe
+        self.sample = sample  # trace every sample-th expansion
+        self.counters = {'generated': 0, 'expanded': 0, 'goal_tests': 0, 'peak_fringe': 0}
+        self.seconds = {'remove': 0.0, 'expand': 0.0}
+        self.last = None
+
+    def start(self, fringe):
+        self.last = perf_counter()
+        self.counters['generated'] += len(fringe)
+        self.counters['peak_fringe'] = max(self.counters['peak_fringe'], len(fringe))
+
+    def goal_test(self, node):  # Called after a node is removed from the fringe
+        now = perf_counter()
+        self.seconds['remove'] += now - self.last
+        self.last = now
+        self.counters['goal_tests'] += 1
+
+    def expanded(self, node, children, fringe):  # Called after the children are in the fringe
+        now = perf_counter()
+        self.seconds['expand'] += now - self.last
+        self.last = now
+        counters = self.counters
+        counters['expanded'] += 1
+        counters['generated'] += len(children)
+        counters['peak_fringe'] = max(counters['peak_fringe'], len(fringe))
+        if self.trace and counters['expanded'] % self.sample == 0:
+            print('expanded: {expanded} generated: {generated} fringe size: {}'.format(len(fringe), **counters))
+            if self.trace > 1:
+                print("fringe: {}".format(fringe))
+
+    def as_dict(self):
+        stats = dict(self.counters)
+        stats.update(('seconds_' + phase, seconds) for phase, seconds in self.seconds.items())
+        return stats
+
+    def to_json(self):
+        return json.dumps(self.as_dict())
+
+    def to_csv(self):
+        stats = self.as_dict()
+        return ','.join(stats) + '\n' + ','.join(str(value) for value in stats.values()) + '\n'
+
+
 '''
-Search the tree for the goal state and return path from initial state to goal state
+Search the tree for the goal state and return path from initial state to goal state.
+fringe is an empty frontier deciding the search order (breadth-first by default),
+observer is told about every goal test and expansion (silent SearchStats by default).
 '''
-def TREE_SEARCH():
-    fringe = []
+def TREE_SEARCH(fringe=None, observer=None):
+    if fringe is None:
+        fringe = FifoFrontier()
+    if observer is None:
+        observer = SearchStats()
     initial_node = Node(INITIAL_STATE)
 
     fringe = INSERT(initial_node, fringe)
-    while fringe is not None:
+    observer.start(fringe)
+    while fringe:
         node = REMOVE_FIRST(fringe)
+        observer.goal_test(node)
         if GOAL_STATE.__contains__(node.STATE):
             return node.path()
         children = EXPAND(node)
         fringe = INSERT_ALL(children, fringe)
-        print("fringe: {}".format(fringe))
+        observer.expanded(node, children, fringe)
+
+
+'''
+Search the graph for the goal state and return path from initial state to goal state.
+States already explored or already waiting in the fringe are not added again,
+so cycles in the state space are only followed once.
+'''
+def GRAPH_SEARCH(fringe=None, observer=None):
+    if fringe is None:
+        fringe = FifoFrontier()
+    if observer is None:
+        observer = SearchStats()
+    initial_node = Node(INITIAL_STATE)
+    explored = set()
+    in_fringe = {INITIAL_STATE}
+
+    fringe = INSERT(initial_node, fringe)
+    observer.start(fringe)
+    while fringe:
+        node = REMOVE_FIRST(fringe)
+        in_fringe.discard(node.STATE)
+        observer.goal_test(node)
+        if GOAL_STATE.__contains__(node.STATE):
+            return node.path()
+        explored.add(node.STATE)
+        children = EXPAND(node)
+        for child in children:
+            if child.STATE not in explored and child.STATE not in in_fringe:
+                in_fringe.add(child.STATE)
+                fringe = INSERT(child, fringe)
+        observer.expanded(node, children, fringe)
 
 
 '''
@@ -44,10 +166,7 @@ def EXPAND(node):
     successors = []
     children = successor_fn(node.STATE)
     for child in children:
-        s = Node(node)  # create node for each in state list
-        s.STATE = child  # e.g. result = 'F' then 'G' from list ['F', 'G']
-        s.PARENT_NODE = node
-        s.DEPTH = node.DEPTH + 1
+        s = Node(child, node, node.DEPTH + 1)  # e.g. child = 'F' then 'G' from list ['F', 'G']
         successors = INSERT(s, successors)
     return successors
 
@@ -68,10 +187,10 @@ def INSERT_ALL(list, queue):
     return queue
 
 '''
-Removes and returns the first element from fringe
+Removes and returns the next element from fringe, in the order of its frontier type
 '''
 def REMOVE_FIRST(queue):
-    return queue.pop(0)
+    return queue.pop()
 '''
 Successor function, mapping the nodes to its successors
 '''
@@ -96,10 +215,18 @@ STATE_SPACE = {('A', D, D): [('A', C, D), ('B', D, D)],
 Run tree search and display the nodes in the path to goal node
 '''
 def run():
-    path = TREE_SEARCH()
+    tree_stats = SearchStats()
+    path = TREE_SEARCH(observer=tree_stats)
     print('Solution path:')
     for node in path:
         node.display()
+    tree_expanded = tree_stats.counters['expanded']
+
+    graph_stats = SearchStats()
+    GRAPH_SEARCH(observer=graph_stats)
+    graph_expanded = graph_stats.counters['expanded']
+    print('Expanded nodes - tree search: {}, graph search: {} ({} saved)'.format(
+        tree_expanded, graph_expanded, tree_expanded - graph_expanded))
 
 
 if __name__ == '__main__':
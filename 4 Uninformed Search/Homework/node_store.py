@@ -0,0 +1,142 @@
+"""
+Compact search node layouts
+
+Every Node in the search scripts is a Python object with its own __dict__.
+NodeStore keeps the same fields in parallel array columns (parent index,
+depth, cost) plus a state intern table, so a node is just an int and path()
+walks integer parent links. SlotsNode is a drop in __slots__ Node for small
+problems. run() compares the memory used by the three layouts.
+"""
+import time
+import tracemalloc
+from array import array
+from collections import deque
+
+from Farmer import Node
+from river_crossing import FARMER
+
+
+class SlotsNode:  # Node without a per-instance __dict__
+    __slots__ = ('STATE', 'PARENT_NODE', 'DEPTH', 'COST')
+
+    def __init__(self, state, parent=None, depth=0, cost=0):
+        self.STATE = state
+        self.PARENT_NODE = parent
+        self.DEPTH = depth
+        self.COST = cost
+
+    def path(self):  # Create a list of nodes from the root to this node.
+        current_node = self
+        path = [self]
+        while current_node.PARENT_NODE:
+            current_node = current_node.PARENT_NODE
+            path.append(current_node)
+        return path
+
+    def __repr__(self):
+        return 'State: ' + str(self.STATE) + ' - Depth: ' + str(self.DEPTH)
+
+
+class NodeStore:  # Nodes as rows of parallel columns; a node is its row index
+    def __init__(self):
+        self.PARENT = array('q')  # -1 for the root
+        self.DEPTH = array('l')
+        self.COST = array('d')
+        self.STATE_ID = array('q')
+        self.states = []  # intern table: state id -> state
+        self.state_ids = {}  # state -> state id
+
+    def intern(self, state):
+        state_id = self.state_ids.get(state)
+        if state_id is None:
+            state_id = self.state_ids[state] = len(self.states)
+            self.states.append(state)
+        return state_id
+
+    def add(self, state, parent=-1, step_cost=0):  # Create a node, return its index
+        self.PARENT.append(parent)
+        if parent < 0:
+            self.DEPTH.append(0)
+            self.COST.append(step_cost)
+        else:
+            self.DEPTH.append(self.DEPTH[parent] + 1)
+            self.COST.append(self.COST[parent] + step_cost)
+        self.STATE_ID.append(self.intern(state))
+        return len(self.PARENT) - 1
+
+    def STATE(self, node):
+        return self.states[self.STATE_ID[node]]
+
+    def path(self, node):  # Node indices from this node back to the root, like Node.path()
+        path = [node]
+        while self.PARENT[node] >= 0:
+            node = self.PARENT[node]
+            path.append(node)
+        return path
+
+    def __len__(self):
+        return len(self.PARENT)
+
+
+def TREE_SEARCH(problem, store, max_nodes):
+    '''
+    Breadth-first tree search that keeps every generated node in the store.
+    Return the goal node index, or None when max_nodes have been generated.
+    '''
+    fringe = deque([store.add(problem.INITIAL_STATE)])
+    while fringe and len(store) < max_nodes:
+        node = fringe.popleft()
+        if store.STATE(node) == problem.GOAL_STATE:
+            return node
+        for child in problem.successor_fn(store.STATE(node)):
+            fringe.append(store.add(child, node, 1))
+    return None
+
+
+STATES = 10000  # distinct states in the benchmark trees; tree search revisits states
+
+
+def measure(name, build, n):
+    tracemalloc.start()
+    start = time.perf_counter()
+    nodes = build(n)
+    elapsed = time.perf_counter() - start
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    print('{:10s} {:>8d} nodes {:>10.1f} MB {:>6.1f} bytes/node {:>7.3f}s'.format(
+        name, n, size / 2 ** 20, size / n, elapsed))
+    return nodes
+
+
+def build_objects(node_class):
+    def build(n):  # n nodes in a tree with branching 4 over STATES states, like a BFS tree
+        nodes = [node_class(0)]
+        for i in range(1, n):
+            parent = nodes[(i - 1) // 4]
+            nodes.append(node_class(i % STATES, parent, parent.DEPTH + 1))
+        return nodes
+    return build
+
+
+def build_store(n):
+    store = NodeStore()
+    store.add(0)
+    for i in range(1, n):
+        store.add(i % STATES, (i - 1) // 4, 1)
+    return store
+
+
+def run(n=500000):
+    print('Memory for {} search nodes:'.format(n))
+    measure('Node', build_objects(Node), n)
+    measure('SlotsNode', build_objects(SlotsNode), n)
+    measure('NodeStore', build_store, n)
+
+    store = NodeStore()
+    goal = TREE_SEARCH(FARMER, store, 10 ** 6)
+    print('\nTree search with NodeStore: {} nodes, {} distinct states, solution depth {}'.format(
+        len(store), len(store.states), store.DEPTH[goal]))
+
+
+if __name__ == '__main__':
+    run()
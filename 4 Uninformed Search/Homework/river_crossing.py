@@ -0,0 +1,110 @@
+"""
+Generalized river crossing puzzles with bit-packed states
+
+Farmer.py lists every state by hand as a tuple of 'East'/'West' strings and
+filters unsafe ones in successor_fn. Here a state is one int with a bit per
+entity (bit set = on the West bank) and successors are computed on the fly
+from the rules, so crossings with many items never enumerate the state space.
+"""
+import sys
+import time
+from collections import deque
+from itertools import combinations
+
+E = 'East'
+W = 'West'
+
+
+class RiverCrossing:  # Puzzle definition: who crosses, who can't be left alone, boat size
+    def __init__(self, entities, conflicts, boat_capacity=2):
+        '''
+        entities[0] is the driver, the only one who can row the boat.
+        conflicts are pairs that may not be left on a bank without the driver.
+        boat_capacity counts the driver.
+        '''
+        self.ENTITIES = tuple(entities)
+        self.BIT = {entity: 1 << i for i, entity in enumerate(self.ENTITIES)}
+        self.DRIVER = 1
+        self.CONFLICTS = [self.BIT[a] | self.BIT[b] for a, b in conflicts]
+        self.BOAT_CAPACITY = boat_capacity
+        self.INITIAL_STATE = 0
+        self.GOAL_STATE = (1 << len(self.ENTITIES)) - 1
+
+    def is_safe(self, state):
+        driver_west = state & self.DRIVER
+        for pair in self.CONFLICTS:
+            both = state & pair
+            if both == pair and not driver_west:  # pair alone on the West bank
+                return False
+            if both == 0 and driver_west:  # pair alone on the East bank
+                return False
+        return True
+
+    def successor_fn(self, state):
+        '''
+        The driver crosses with up to boat_capacity - 1 passengers from the
+        same bank. Yield every resulting safe state.
+        '''
+        driver_side = state & self.DRIVER
+        passengers = [1 << i for i in range(1, len(self.ENTITIES))
+                      if (state >> i) & 1 == driver_side]
+        for size in range(self.BOAT_CAPACITY):
+            for group in combinations(passengers, size):
+                child = state ^ self.DRIVER ^ sum(group)
+                if self.is_safe(child):
+                    yield child
+
+    def decode(self, state):  # Same form as the states in Farmer.py
+        return tuple(W if (state >> i) & 1 else E for i in range(len(self.ENTITIES)))
+
+
+def BREADTH_FIRST_SEARCH(problem):
+    '''
+    Graph search over packed states. The parent map holds one int per
+    reached state. Return the list of states from initial to goal state.
+    '''
+    parent = {problem.INITIAL_STATE: None}
+    fringe = deque([problem.INITIAL_STATE])
+    while fringe:
+        state = fringe.popleft()
+        if state == problem.GOAL_STATE:
+            path = []
+            while state is not None:
+                path.append(state)
+                state = parent[state]
+            return path[::-1]
+        for child in problem.successor_fn(state):
+            if child not in parent:
+                parent[child] = state
+                fringe.append(child)
+    return None
+
+
+# Farmer, Goat, Cabbage, Wolf, in the order used by Farmer.py
+FARMER = RiverCrossing(('Farmer', 'Goat', 'Cabbage', 'Wolf'),
+                       [('Goat', 'Cabbage'), ('Wolf', 'Goat')], boat_capacity=2)
+
+
+def WITH_SACKS(n, boat_capacity=2):  # The farmer's puzzle plus n sacks that also have to cross
+    return RiverCrossing(FARMER.ENTITIES + tuple('Sack{}'.format(i) for i in range(n)),
+                         [('Goat', 'Cabbage'), ('Wolf', 'Goat')], boat_capacity)
+
+
+def run():
+    path = BREADTH_FIRST_SEARCH(FARMER)
+    print('Solution path:')
+    for depth, state in enumerate(path):
+        print('State: {} - Depth: {}'.format(FARMER.decode(state), depth))
+    print('Bytes per state - tuple of strings: {}, packed int: {}'.format(
+        sys.getsizeof(FARMER.decode(path[-1])), sys.getsizeof(path[-1])))
+
+    for n in (6, 10, 14):
+        problem = WITH_SACKS(n)
+        start = time.perf_counter()
+        path = BREADTH_FIRST_SEARCH(problem)
+        print('{} sacks: {} crossings, {} possible states, {:.3f}s'.format(
+            n, len(path) - 1, 2 ** len(problem.ENTITIES), time.perf_counter() - start))
+
+
+if __name__ == '__main__':
+    run()
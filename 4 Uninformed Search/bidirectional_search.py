@@ -0,0 +1,130 @@
+"""
+Bidirectional breadth-first search over explicit state spaces
+
+Builds a predecessor index from a successor dict once, then searches
+forward from the initial state and backward from every goal state at the
+same time. The two searches meet in the middle, so a problem with branching
+factor b and solution depth d expands about 2 * b^(d/2) nodes instead of b^d.
+"""
+import random
+import time
+
+from problems import PROBLEMS, path_to, successor_dict
+
+
+def PREDECESSOR_INDEX(successors):  # Reverse every edge of a {state: [successors]} dict
+    predecessors = {state: [] for state in successors}
+    for state, children in successors.items():
+        for child in children:
+            predecessors.setdefault(child, []).append(state)
+    return predecessors
+
+
+def BIDIRECTIONAL_SEARCH(successors, initial_state, goal_states, predecessors=None):
+    '''
+    Return (path from initial state to the nearest goal state, number of
+    expanded nodes), or (None, expanded) if no goal state can be reached.
+    Each step expands one whole layer of the smaller frontier and joins the
+    shortest of the paths meeting in that layer.
+    '''
+    if predecessors is None:
+        predecessors = PREDECESSOR_INDEX(successors)
+    forward = {initial_state: None}  # state -> parent towards the initial state
+    backward = {goal: None for goal in goal_states}  # state -> parent towards a goal
+    if initial_state in backward:
+        return [initial_state], 0
+    forward_layer = [initial_state]
+    backward_layer = list(backward)
+    depth = {initial_state: 0}
+    back_depth = dict.fromkeys(backward, 0)
+    expanded = 0
+
+    while forward_layer and backward_layer:
+        if len(forward_layer) <= len(backward_layer):
+            layer, parents, depths, other, other_depths, edges = \
+                forward_layer, forward, depth, backward, back_depth, successors
+        else:
+            layer, parents, depths, other, other_depths, edges = \
+                backward_layer, backward, back_depth, forward, depth, predecessors
+
+        best = None
+        next_layer = []
+        for state in layer:
+            expanded += 1
+            for child in edges.get(state, ()):
+                if child in parents:
+                    continue
+                parents[child] = state
+                depths[child] = depths[state] + 1
+                next_layer.append(child)
+                if child in other:
+                    length = depths[child] + other_depths[child]
+                    if best is None or length < best[0]:
+                        best = (length, child)
+
+        if best is not None:
+            meet = best[1]
+            return path_to(forward, meet) + path_to(backward, meet)[::-1][1:], expanded
+
+        if parents is forward:
+            forward_layer = next_layer
+        else:
+            backward_layer = next_layer
+    return None, expanded
+
+
+def BREADTH_FIRST_SEARCH(successors, initial_state, goal_states):
+    '''
+    Forward-only graph search for comparison.
+    Return (path, number of expanded nodes).
+    '''
+    goals = set(goal_states)
+    parents = {initial_state: None}
+    layer = [initial_state]
+    expanded = 0
+    while layer:
+        next_layer = []
+        for state in layer:
+            if state in goals:
+                return path_to(parents, state), expanded
+            expanded += 1
+            for child in successors.get(state, ()):
+                if child not in parents:
+                    parents[child] = state
+                    next_layer.append(child)
+        layer = next_layer
+    return None, expanded
+
+
+def random_graph(n, branching, seed=0):  # n states, each with branching random successors
+    rng = random.Random(seed)
+    return {state: [rng.randrange(n) for i in range(branching)] for state in range(n)}
+
+
+def run():
+    for name, script, goals in PROBLEMS:
+        successors = successor_dict(script)
+        path, expanded = BIDIRECTIONAL_SEARCH(successors, script.INITIAL_STATE, goals)
+        bfs_path, bfs_expanded = BREADTH_FIRST_SEARCH(successors, script.INITIAL_STATE, goals)
+        print('{:8s} depth {}  expanded - bidirectional: {}, breadth-first: {}'.format(
+            name, len(path) - 1, expanded, bfs_expanded))
+        assert len(path) == len(bfs_path)
+
+    successors = random_graph(200000, 3)
+    start = time.perf_counter()
+    predecessors = PREDECESSOR_INDEX(successors)
+    print('\nRandom graph, 200000 states, branching 3 (predecessor index {:.2f}s)'.format(
+        time.perf_counter() - start))
+    for goal in (1, 2, 3):
+        start = time.perf_counter()
+        path, expanded = BIDIRECTIONAL_SEARCH(successors, 0, [goal], predecessors)
+        bidirectional_time = time.perf_counter() - start
+        start = time.perf_counter()
+        bfs_path, bfs_expanded = BREADTH_FIRST_SEARCH(successors, 0, [goal])
+        print('goal {} depth {}  expanded - bidirectional: {} ({:.4f}s), breadth-first: {} ({:.4f}s)'.format(
+            goal, len(path) - 1, expanded, bidirectional_time, bfs_expanded, time.perf_counter() - start))
+        assert len(path) == len(bfs_path)
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,209 @@
+"""
+External-memory breadth-first search
+
+Keeps the frontier and the visited set on disk instead of in a list and a
+dict. Each layer is a file of sorted, unique packed states (uint64). To build
+the next layer, the current one is streamed through memory-mapped reads,
+children are collected into sorted runs of at most memory_states states,
+the runs are merged a block of each at a time, and states found in
+earlier layers are dropped by binary search in their memory-mapped files.
+Expansion and merging each hold about memory_states states, no matter how
+big a layer or the state space is.
+
+States must be ints, like the packed states of river_crossing.py.
+"""
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from problems import load
+
+CHUNK = 1 << 16  # states read from a file at a time
+MIN_BLOCK = 1024  # smallest block read from each run in a merge
+
+
+def read_states(path):  # Memory-mapped view of a state file
+    if os.path.getsize(path) == 0:
+        return np.zeros(0, dtype=np.uint64)
+    return np.memmap(path, dtype=np.uint64, mode='r')
+
+
+def iter_chunks(path):
+    states = read_states(path)
+    for i in range(0, len(states), CHUNK):
+        yield states[i:i + CHUNK]
+
+
+def write_run(buffer, path):  # Sort and deduplicate a buffer of states into a run file
+    np.unique(np.array(buffer, dtype=np.uint64)).tofile(path)
+
+
+def merge_runs(run_paths, path, memory_states):
+    '''
+    k-way merge of sorted run files into one sorted file without duplicates,
+    holding at most about memory_states states. Each run is read in blocks
+    of memory_states // k; everything up to the smallest last state of the
+    current blocks is safe to merge, so it is sorted and written as one
+    NumPy array. With more than memory_states // MIN_BLOCK runs, groups of
+    runs are first merged into intermediate files.
+    '''
+    fan_in = max(2, memory_states // MIN_BLOCK)
+    passes = 0
+    while len(run_paths) > fan_in:
+        passes += 1
+        groups = [run_paths[i:i + fan_in] for i in range(0, len(run_paths), fan_in)]
+        merged = ['{}.pass{}_{}'.format(path, passes, i) for i in range(len(groups))]
+        for group, merged_path in zip(groups, merged):
+            merge_runs(group, merged_path, memory_states)
+        if passes > 1:  # the inputs were intermediate files of the previous pass
+            for run_path in run_paths:
+                os.remove(run_path)
+        run_paths = merged
+
+    block = max(1, memory_states // max(1, len(run_paths)))
+    runs = [read_states(run_path) for run_path in run_paths]
+    positions = [0] * len(runs)
+    blocks = [np.array(run[:block]) for run in runs]
+    last = None
+    with open(path, 'wb') as f:
+        while True:
+            active = [i for i in range(len(runs)) if len(blocks[i])]
+            if not active:
+                break
+            bound = min(blocks[i][-1] for i in active)
+            taken = []
+            for i in active:
+                end = int(np.searchsorted(blocks[i], bound, side='right'))
+                taken.append(blocks[i][:end])
+                blocks[i] = blocks[i][end:]
+                if not len(blocks[i]):  # refill from the run file
+                    positions[i] += block
+                    blocks[i] = np.array(runs[i][positions[i]:positions[i] + block])
+            out = np.unique(np.concatenate(taken))
+            if last is not None and len(out) and out[0] == last:
+                out = out[1:]
+            if len(out):
+                out.tofile(f)
+                last = out[-1]
+    del runs
+    if passes:
+        for run_path in run_paths:
+            os.remove(run_path)
+
+
+def subtract_layers(path, layer_paths, out_path):
+    '''
+    Stream the sorted states in path and write those not in any of the
+    sorted layer files to out_path. Return the number of states written.
+    '''
+    layers = [read_states(layer_path) for layer_path in layer_paths]
+    written = 0
+    with open(out_path, 'wb') as f:
+        for chunk in iter_chunks(path):
+            keep = np.ones(len(chunk), dtype=bool)
+            for layer in layers:
+                if len(layer):
+                    index = np.minimum(np.searchsorted(layer, chunk), len(layer) - 1)
+                    keep &= layer[index] != chunk
+            chunk[keep].tofile(f)
+            written += int(keep.sum())
+    return written
+
+
+def contains(path, state):
+    states = read_states(path)
+    index = np.searchsorted(states, np.uint64(state))
+    return index < len(states) and states[index] == state
+
+
+def EXPAND_LAYER(problem, layer_path, directory, depth, memory_states):
+    '''
+    Write the successors of every state in the layer to sorted run files
+    holding at most memory_states states each, and return their paths.
+    '''
+    run_paths = []
+    buffer = []
+    for chunk in iter_chunks(layer_path):
+        for state in chunk.tolist():
+            buffer.extend(problem.successor_fn(state))
+            if len(buffer) >= memory_states:
+                run_paths.append(os.path.join(directory, 'run_{}_{}.bin'.format(depth, len(run_paths))))
+                write_run(buffer, run_paths[-1])
+                buffer = []
+    if buffer or not run_paths:
+        run_paths.append(os.path.join(directory, 'run_{}_{}.bin'.format(depth, len(run_paths))))
+        write_run(buffer, run_paths[-1])
+    return run_paths
+
+
+def EXTERNAL_BREADTH_FIRST_SEARCH(problem, directory, memory_states=1 << 20, keep_layers=None, stop_at_goal=True):
+    '''
+    Layer by layer search from problem.INITIAL_STATE, with layer d stored in
+    directory/layer_d.bin. keep_layers limits how many earlier layers new
+    states are checked against: None checks all of them, 2 is enough when
+    every move can be undone (an undirected state space).
+    Return (list of layer sizes, depth of the goal or None if it was not reached).
+    '''
+    layer_paths = [os.path.join(directory, 'layer_0.bin')]
+    np.array([problem.INITIAL_STATE], dtype=np.uint64).tofile(layer_paths[0])
+    sizes = [1]
+    goal_depth = None
+    while sizes[-1]:
+        if goal_depth is None and contains(layer_paths[-1], problem.GOAL_STATE):
+            goal_depth = len(layer_paths) - 1
+            if stop_at_goal:
+                break
+        depth = len(layer_paths)
+        run_paths = EXPAND_LAYER(problem, layer_paths[-1], directory, depth, memory_states)
+        merged_path = os.path.join(directory, 'merged_{}.bin'.format(depth))
+        merge_runs(run_paths, merged_path, memory_states)
+        for run_path in run_paths:
+            os.remove(run_path)
+
+        previous = layer_paths[-keep_layers:] if keep_layers else layer_paths[:]
+        layer_paths.append(os.path.join(directory, 'layer_{}.bin'.format(depth)))
+        sizes.append(subtract_layers(merged_path, previous, layer_paths[-1]))
+        os.remove(merged_path)
+    return sizes, goal_depth
+
+
+def SOLUTION_PATH(problem, directory, goal_depth):
+    '''
+    Rebuild the path to the goal from the layer files by scanning each
+    earlier layer for a parent of the current state. Return None if the
+    goal was not reached (goal_depth None).
+    '''
+    if goal_depth is None:
+        return None
+    depth = goal_depth
+    state = problem.GOAL_STATE
+    path = [state]
+    while depth > 0:
+        depth -= 1
+        layer_path = os.path.join(directory, 'layer_{}.bin'.format(depth))
+        state = next(parent for chunk in iter_chunks(layer_path) for parent in chunk.tolist()
+                     if state in problem.successor_fn(parent))
+        path.append(state)
+    return path[::-1]
+
+
+def run(sacks=12, memory_states=20000):
+    crossing = load(os.path.join('Homework', 'river_crossing.py'))
+    problem = crossing.WITH_SACKS(sacks)
+    with tempfile.TemporaryDirectory() as directory:
+        start = time.perf_counter()
+        sizes, goal_depth = EXTERNAL_BREADTH_FIRST_SEARCH(problem, directory, memory_states, stop_at_goal=False)
+        print('Farmer with {} sacks, at most {} states in memory: {} states reachable in {} layers, {:.2f}s'.format(
+            sacks, memory_states, sum(sizes), len(sizes) - 1, time.perf_counter() - start))
+
+    with tempfile.TemporaryDirectory() as directory:
+        sizes, goal_depth = EXTERNAL_BREADTH_FIRST_SEARCH(problem, directory, memory_states, keep_layers=2)
+        path = SOLUTION_PATH(problem, directory, goal_depth)
+        print('Solution: {} crossings (in memory search: {})'.format(
+            len(path) - 1, len(crossing.BREADTH_FIRST_SEARCH(problem)) - 1))
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,82 @@
+"""
+Iterative deepening depth-first search
+
+Runs a depth-limited DFS with limit 0, 1, 2, ... until the goal is found.
+Only the current path and one successor iterator per level are kept, so
+memory is O(depth) while TREE_SEARCH's FIFO fringe keeps every generated
+node alive. Optionally skips states already on the current path.
+"""
+import os
+import time
+
+from problems import PROBLEMS, load
+
+CUTOFF = 'cutoff'
+
+
+def DEPTH_LIMITED_SEARCH(successor_fn, initial_state, goal_test, limit, check_cycles=True):
+    '''
+    Depth-first search to at most limit steps, without recursion.
+    Return (path, expanded) where path is the list of states to a goal,
+    CUTOFF if the limit stopped the search, or None if there is no solution.
+    '''
+    if goal_test(initial_state):
+        return [initial_state], 0
+    path = [initial_state]
+    on_path = {initial_state}
+    stack = [iter(successor_fn(initial_state))] if limit > 0 else []
+    expanded = 1 if stack else 0
+    result = None if limit > 0 else CUTOFF
+    while stack:
+        child = next(stack[-1], None)
+        if child is None:  # every successor of path[-1] is done
+            stack.pop()
+            on_path.discard(path.pop())
+            continue
+        if check_cycles and child in on_path:
+            continue
+        if goal_test(child):
+            return path + [child], expanded
+        if len(path) == limit:
+            result = CUTOFF
+            continue
+        path.append(child)
+        on_path.add(child)
+        stack.append(iter(successor_fn(child)))
+        expanded += 1
+    return result, expanded
+
+
+def ITERATIVE_DEEPENING_SEARCH(successor_fn, initial_state, goal_test, max_depth=100, check_cycles=True):
+    '''
+    Return (path or None, list of nodes expanded in each depth iteration).
+    '''
+    counts = []
+    for limit in range(max_depth + 1):
+        result, expanded = DEPTH_LIMITED_SEARCH(successor_fn, initial_state, goal_test, limit, check_cycles)
+        counts.append(expanded)
+        if result != CUTOFF:
+            return result, counts
+    return None, counts
+
+
+def run():
+    for name, script, goals in PROBLEMS:
+        for check_cycles in (False, True):
+            path, counts = ITERATIVE_DEEPENING_SEARCH(script.successor_fn, script.INITIAL_STATE,
+                                                      goals.__contains__, check_cycles=check_cycles)
+            print('{:8s} cycle check: {:5s} depth {}  expanded per depth: {}'.format(
+                name, str(check_cycles), len(path) - 1, counts))
+
+    crossing = load(os.path.join('Homework', 'river_crossing.py'))
+    for n in (1, 2, 3, 4):
+        problem = crossing.WITH_SACKS(n)
+        start = time.perf_counter()
+        path, counts = ITERATIVE_DEEPENING_SEARCH(problem.successor_fn, problem.INITIAL_STATE,
+                                                  problem.GOAL_STATE.__eq__)
+        print('Farmer with {} sacks: depth {}, {} nodes expanded in total, {:.3f}s'.format(
+            n, len(path) - 1, sum(counts), time.perf_counter() - start))
+
+
+if __name__ == '__main__':
+    run()
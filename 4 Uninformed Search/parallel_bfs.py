@@ -0,0 +1,113 @@
+"""
+Level-synchronous parallel breadth-first search
+
+Each frontier layer is split into chunks that a process pool expands with
+the problem's successor_fn. Workers send back packed arrays of (child,
+parent) states and the coordinator deduplicates them against its visited
+map. Chunks are merged in layer order, so every state gets the same parent
+as in the serial search and the same shortest path comes out.
+
+States must be ints, like the packed states of river_crossing.py.
+"""
+import os
+import sys
+import time
+from array import array
+from contextlib import contextmanager
+from multiprocessing import Pool, cpu_count
+
+from problems import load, path_to
+
+worker_problem = None  # the problem, set once in every worker process
+
+
+def init_worker(problem):
+    global worker_problem
+    worker_problem = problem
+
+
+def EXPAND_CHUNK(states):
+    '''
+    Expand a chunk of a layer in a worker. Return two arrays: the children
+    (first occurrence only, in generation order) and the parent of each.
+    '''
+    children = array('q')
+    parents = array('q')
+    seen = set()
+    successor_fn = worker_problem.successor_fn
+    for state in states:
+        for child in successor_fn(state):
+            if child not in seen:
+                seen.add(child)
+                children.append(child)
+                parents.append(state)
+    return children, parents
+
+
+@contextmanager
+def SCRIPT_ON_PATH(problem):
+    '''
+    Spawned workers (Windows, macOS) unpickle the problem by importing its
+    module by name, which only works if a script loaded by path through
+    problems.load is on sys.path. Workers copy sys.path when they start, so
+    it is put back at the end of the with block.
+    '''
+    saved_path = list(sys.path)
+    sys.path.append(os.path.dirname(os.path.abspath(sys.modules[type(problem).__module__].__file__)))
+    try:
+        yield
+    finally:
+        sys.path[:] = saved_path
+
+
+def PARALLEL_BREADTH_FIRST_SEARCH(problem, workers=None, chunk_size=2000):
+    '''
+    Return (path from problem.INITIAL_STATE to problem.GOAL_STATE or None,
+    number of states reached). Layers smaller than chunk_size are expanded
+    in the coordinator, bigger ones are split across the pool.
+    '''
+    parents = {problem.INITIAL_STATE: None}
+    layer = array('q', [problem.INITIAL_STATE])
+    init_worker(problem)
+    with SCRIPT_ON_PATH(problem), Pool(workers or cpu_count(), initializer=init_worker, initargs=(problem,)) as pool:
+        while layer:
+            if problem.GOAL_STATE in parents:
+                break
+            if len(layer) <= chunk_size:
+                results = [EXPAND_CHUNK(layer)]
+            else:
+                chunks = [layer[i:i + chunk_size] for i in range(0, len(layer), chunk_size)]
+                results = pool.map(EXPAND_CHUNK, chunks)
+            layer = array('q')
+            for children, chunk_parents in results:
+                for child, parent in zip(children, chunk_parents):
+                    if child not in parents:
+                        parents[child] = parent
+                        layer.append(child)
+    if problem.GOAL_STATE not in parents:
+        return None, len(parents)
+    return path_to(parents, problem.GOAL_STATE), len(parents)
+
+
+def run(sacks=14):
+    crossing = load(os.path.join('Homework', 'river_crossing.py'))
+    problem = crossing.WITH_SACKS(sacks)
+
+    start = time.perf_counter()
+    serial_path = crossing.BREADTH_FIRST_SEARCH(problem)
+    serial_time = time.perf_counter() - start
+    print('Farmer with {} sacks, serial: {} crossings, {:.2f}s'.format(sacks, len(serial_path) - 1, serial_time))
+
+    workers = 1
+    while workers <= cpu_count():
+        start = time.perf_counter()
+        path, reached = PARALLEL_BREADTH_FIRST_SEARCH(problem, workers)
+        elapsed = time.perf_counter() - start
+        print('{:3d} workers: {} states reached, {:.2f}s ({:.2f}x serial)'.format(
+            workers, reached, elapsed, serial_time / elapsed))
+        assert path == serial_path
+        workers *= 2
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,53 @@
+"""
+Example problems from the chapter scripts
+
+The Exercises and Homework folders are not packages, so the search engines
+in this folder load Letters.py, Vacuum.py and Farmer.py by path to run on
+the same STATE_SPACE dicts. path_to is shared by the engines.
+"""
+import importlib.util
+import os
+import sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def load(relative_path):  # Import a script by its path relative to this folder
+    name = os.path.splitext(os.path.basename(relative_path))[0]
+    if name not in sys.modules:
+        spec = importlib.util.spec_from_file_location(name, os.path.join(HERE, relative_path))
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[name] = module
+        spec.loader.exec_module(module)
+    return sys.modules[name]
+
+
+def successor_dict(script):
+    '''
+    Apply the script's successor_fn to every state in its STATE_SPACE, so
+    filtered successors (e.g. the unsafe states in Farmer.py) are left out.
+    States reached but missing from STATE_SPACE get no successors.
+    '''
+    successors = {state: list(script.successor_fn(state)) for state in script.STATE_SPACE}
+    for children in list(successors.values()):
+        for child in children:
+            successors.setdefault(child, [])
+    return successors
+
+
+def path_to(parents, state):  # States from the search root to state, following a {state: parent} map
+    path = []
+    while state is not None:
+        path.append(state)
+        state = parents[state]
+    return path[::-1]
+
+
+LETTERS = load(os.path.join('Exercises', 'Letters.py'))
+VACUUM = load(os.path.join('Exercises', 'Vacuum.py'))
+FARMER = load(os.path.join('Homework', 'Farmer.py'))
+
+# (name, script, goal states) for every example problem
+PROBLEMS = [('Letters', LETTERS, [LETTERS.GOAL_STATE]),
+            ('Vacuum', VACUUM, list(VACUUM.GOAL_STATE)),
+            ('Farmer', FARMER, [FARMER.GOAL_STATE])]
@@ -0,0 +1,144 @@
+"""
+N-room vacuum worlds with bitmask states
+
+Vacuum.py spells out the eight states of the two-room world by hand. Here a
+state is one int, location * 2^N + dirt bitmask, for N rooms with any
+adjacency, and successors are computed arithmetically. A VacuumWorld works
+as Vacuum.py's STATE_SPACE (world[state] gives the successors) and its
+GOAL_STATE (any state with no dirt), so it plugs straight into
+TREE_SEARCH, GRAPH_SEARCH and run() for the length of a with PLUG_INTO block.
+
+run() is a scaling benchmark from N = 2 to N = 20 rooms that shows where
+each search strategy stops being viable.
+"""
+import time
+from contextlib import contextmanager
+
+from iterative_deepening import ITERATIVE_DEEPENING_SEARCH
+from problems import VACUUM
+
+D = 'Dirty'
+C = 'Clean'
+
+
+class CleanStates:  # Goal test: every state whose dirt bitmask is 0
+    def __init__(self, rooms):
+        self.MASK = (1 << rooms) - 1
+
+    def __contains__(self, state):
+        return state & self.MASK == 0
+
+
+class VacuumWorld:  # N rooms, adjacency {room: [neighbouring rooms]}
+    def __init__(self, adjacency):
+        self.ROOMS = len(adjacency)
+        self.ADJACENCY = [list(adjacency[room]) for room in range(self.ROOMS)]
+        self.MASK = (1 << self.ROOMS) - 1
+        self.GOAL_STATE = CleanStates(self.ROOMS)
+
+    def encode(self, location, dirt):
+        return (location << self.ROOMS) | dirt
+
+    def initial_state(self, location=0):  # Start in location with every room dirty
+        return self.encode(location, self.MASK)
+
+    def __getitem__(self, state):  # Successors: suck if dirty, then move to each neighbour
+        location = state >> self.ROOMS
+        dirt = state & self.MASK
+        successors = []
+        if dirt >> location & 1:
+            successors.append(state & ~(1 << location))
+        for room in self.ADJACENCY[location]:
+            successors.append((room << self.ROOMS) | dirt)
+        return successors
+
+    def decode(self, state):  # Vacuum.py's form, e.g. ('A', 'Clean', 'Dirty')
+        location = state >> self.ROOMS
+        return (chr(ord('A') + location),) + tuple(D if state >> room & 1 else C for room in range(self.ROOMS))
+
+    def __len__(self):
+        return self.ROOMS << self.ROOMS
+
+
+def LINE(n):  # n rooms in a row, like A - B
+    return {room: [other for other in (room - 1, room + 1) if 0 <= other < n] for room in range(n)}
+
+
+def GRID(rows, cols):  # rows x cols rooms, each connected to its 4 neighbours
+    adjacency = {}
+    for room in range(rows * cols):
+        row, col = divmod(room, cols)
+        adjacency[room] = [r * cols + c for r, c in ((row - 1, col), (row + 1, col), (row, col - 1), (row, col + 1))
+                           if 0 <= r < rows and 0 <= c < cols]
+    return adjacency
+
+
+@contextmanager
+def PLUG_INTO(script, world, initial_state):  # Make the script's searches run on this world inside a with block
+    saved = script.STATE_SPACE, script.GOAL_STATE, script.INITIAL_STATE
+    script.STATE_SPACE = world
+    script.GOAL_STATE = world.GOAL_STATE
+    script.INITIAL_STATE = initial_state
+    try:
+        yield script
+    finally:
+        script.STATE_SPACE, script.GOAL_STATE, script.INITIAL_STATE = saved
+
+
+class BudgetExceeded(Exception):
+    pass
+
+
+class Budget:  # STATE_SPACE wrapper that stops a search after max_expansions or seconds
+    def __init__(self, world, max_expansions, seconds):
+        self.world = world
+        self.GOAL_STATE = world.GOAL_STATE
+        self.expansions = 0
+        self.max_expansions = max_expansions
+        self.deadline = time.perf_counter() + seconds
+
+    def __getitem__(self, state):
+        self.expansions += 1
+        if self.expansions > self.max_expansions or \
+                (self.expansions % 1024 == 0 and time.perf_counter() > self.deadline):
+            raise BudgetExceeded()
+        return self.world[state]
+
+
+def run(max_rooms=20, max_expansions=2 * 10 ** 6, seconds=20):
+    world = VacuumWorld(LINE(2))
+    with PLUG_INTO(VACUUM, world, world.initial_state()):
+        path = VACUUM.TREE_SEARCH()
+    print('Two rooms through Vacuum.TREE_SEARCH:', [world.decode(node.STATE) for node in path[::-1]])
+
+    strategies = [
+        ('BFS tree', lambda: VACUUM.TREE_SEARCH()),
+        ('BFS graph', lambda: VACUUM.GRAPH_SEARCH()),
+        ('DFS graph', lambda: VACUUM.GRAPH_SEARCH(VACUUM.LifoFrontier())),
+        ('IDDFS', lambda: ITERATIVE_DEEPENING_SEARCH(VACUUM.successor_fn, VACUUM.INITIAL_STATE,
+                                                     VACUUM.GOAL_STATE.__contains__)[0]),
+    ]
+    print('\n{:>5s}{:>12s}'.format('rooms', 'states') + ''.join('{:>22s}'.format(name) for name, search in strategies))
+    viable = {name: True for name, search in strategies}
+    for n in range(2, max_rooms + 1, 2):
+        world = VacuumWorld(LINE(n))
+        row = '{:>5d}{:>12d}'.format(n, len(world))
+        for name, search in strategies:
+            if not viable[name]:
+                row += '{:>22s}'.format('-')
+                continue
+            budget = Budget(world, max_expansions, seconds)
+            start = time.perf_counter()
+            try:
+                with PLUG_INTO(VACUUM, budget, world.initial_state()):
+                    result = search()
+                length = len(result) - 1
+                row += '{:>22s}'.format('{} steps {:.2f}s'.format(length, time.perf_counter() - start))
+            except BudgetExceeded:
+                viable[name] = False
+                row += '{:>22s}'.format('over budget')
+        print(row)
+
+
+if __name__ == '__main__':
+    run()
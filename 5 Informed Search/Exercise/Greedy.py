@@ -1,3 +1,9 @@
+import json
+from heapq import heappop, heappush
+from itertools import count
+from time import perf_counter
+
+
 class Node:  # Node has only PARENT_NODE, STATE, DEPTH
     def __init__(self, state, parent=None, depth=0, pathcost=0):
         self.STATE = state
@@ -20,21 +26,95 @@ class Node:  # Node has only PARENT_NODE, STATE, DEPTH
         return 'State: ' + str(self.STATE) + ' - Depth: ' + str(self.DEPTH)
 
 
+class HeuristicFrontier:  # Fringe as a heap on HEURISTIC_LOOKUP, pop() is O(log n)
+    def __init__(self):
+        self.heap = []
+        self.generation = count()  # ties are popped in insertion order
+
+    def append(self, node):
+        heappush(self.heap, (HEURISTIC_LOOKUP[node.STATE], next(self.generation), node))
+
+    def extend(self, nodes):
+        for node in nodes:
+            self.append(node)
+
+    def pop(self):
+        return heappop(self.heap)[2]
+
+    def __len__(self):
+        return len(self.heap)
+
+    def __repr__(self):
+        return repr([node for (heuristic, generation, node) in sorted(self.heap)])
+
+
+class SearchStats:  # Search observer: counters, time per phase and sampled tracing
+    def __init__(self, trace=0, sample=1):
+        self.trace = trace  # 0 silent, 1 print counters, 2 also print the fringe
+        self.sample = sample  # trace every sample-th expansion
+        self.counters = {'generated': 0, 'expanded': 0, 'goal_tests': 0, 'peak_fringe': 0}
+        self.seconds = {'remove': 0.0, 'expand': 0.0}
+        self.last = None
+
+    def start(self, fringe):
+        self.last = perf_counter()
+        self.counters['generated'] += len(fringe)
+        self.counters['peak_fringe'] = max(self.counters['peak_fringe'], len(fringe))
+
+    def goal_test(self, node):  # Called after a node is removed from the fringe
+        now = perf_counter()
+        self.seconds['remove'] += now - self.last
+        self.last = now
+        self.counters['goal_tests'] += 1
+
+    def expanded(self, node, children, fringe):  # Called after the children are in the fringe
+        now = perf_counter()
+        self.seconds['expand'] += now - self.last
+        self.last = now
+        counters = self.counters
+        counters['expanded'] += 1
+        counters['generated'] += len(children)
+        counters['peak_fringe'] = max(counters['peak_fringe'], len(fringe))
+        if self.trace and counters['expanded'] % self.sample == 0:
+            print('expanded: {expanded} generated: {generated} fringe size: {}'.format(len(fringe), **counters))
+            if self.trace > 1:
+                print("fringe: {}".format(fringe))
+
+    def as_dict(self):
+        stats = dict(self.counters)
+        stats.update(('seconds_' + phase, seconds) for phase, seconds in self.seconds.items())
+        return stats
+
+    def to_json(self):
+        return json.dumps(self.as_dict())
+
+    def to_csv(self):
+        stats = self.as_dict()
+        return ','.join(stats) + '\n' + ','.join(str(value) for value in stats.values()) + '\n'
+
+
 '''
-Search the tree for the goal state and return path from initial state to goal state
+Search the tree for the goal state and return path from initial state to goal state.
+fringe is an empty frontier (a HeuristicFrontier heap by default),
+observer is told about every goal test and expansion (silent SearchStats by default).
 '''
-def TREE_SEARCH():
-    fringe = []
+def TREE_SEARCH(fringe=None, observer=None):
+    if fringe is None:
+        fringe = HeuristicFrontier()
+    if observer is None:
+        observer = SearchStats()
     initial_node = Node(INITIAL_STATE)
 
     fringe = INSERT(initial_node, fringe)
-    while fringe is not None:
+    observer.start(fringe)
+    while fringe:
         node = REMOVE_BEST(fringe)
+        observer.goal_test(node)
         if GOAL_STATE.__contains__(node.STATE):
             return node.path()
         children = EXPAND(node)
         fringe = INSERT_ALL(children, fringe)
-        print("fringe: {}".format(fringe))
+        observer.expanded(node, children, fringe)
 
 
 '''
@@ -69,19 +149,11 @@ def INSERT_ALL(list, queue):
     return queue
 
 '''
-Removes and returns the first element from fringe
+Removes and returns the node with the lowest heuristic value from fringe
+(the first one inserted if several are equally good)
 '''
 def REMOVE_BEST(queue):
-    index = 0
-    bestIndex = 0
-    for node in queue:
-        if index == 0:
-            best = HEURISTIC_LOOKUP[node.STATE]
-        if HEURISTIC_LOOKUP[node.STATE] < best:
-            best = HEURISTIC_LOOKUP[node.STATE]
-            bestIndex = index
-        index += 1
-    return queue.pop(bestIndex)
+    return queue.pop()
 '''
 Successor function, mapping the nodes to its successors
 '''
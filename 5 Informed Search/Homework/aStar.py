@@ -49,7 +49,7 @@ def EXPAND(node):
         s.STATE = child  # e.g. result = 'F' then 'G' from list ['F', 'G']
         s.PARENT_NODE = node
         s.DEPTH = node.DEPTH + 1
-        s.COST = cost_lookup[node.STATE][child]
+        s.COST = node.COST + cost_lookup[node.STATE][child]  # path cost g, not just the last edge
 
         successors = INSERT(s, successors)
 
@@ -113,11 +113,6 @@ cost_lookup = {
         'I': 4,
         'J': 2,
     },
-    'D': {
-        'H': 1,
-        'I': 4,
-        'J': 2,
-    },
     'E': {
         'G': 2,
         'H': 3,
@@ -0,0 +1,107 @@
+"""
+Anytime repairing A* (ARA*)
+
+Weighted A* orders the open list by g + w * h. With w > 1 it finds a path
+quickly, costing at most w times the optimum. ARA* starts with a high
+weight and, after each solution, lowers it and carries on from where it
+stopped instead of searching again from scratch. States whose g improved
+after they were expanded are set aside during an iteration and put back
+into the open list for the next one. Every better path is yielded with its
+suboptimality bound, until the weight reaches 1 (optimal) or the
+expansion or time budget runs out.
+"""
+import math
+import time
+from heapq import heapify, heappop, heappush
+from itertools import count
+
+from ida_star import SlidingPuzzle
+from problems import ASTAR, astar_cost, path_to
+
+
+def ARA_STAR_SEARCH(successor_fn, cost_fn, heuristic, initial_state, goal_states,
+                    weight=5.0, step=0.5, max_expansions=None, seconds=None):
+    '''
+    Generator of (path, cost, bound, expanded) for every improved solution,
+    where expanded counts the nodes expanded so far. If the heuristic is
+    admissible, cost <= bound * optimal cost; otherwise the bound means
+    nothing. Stops after the weight 1 iteration, or when the budget runs out.
+    '''
+    goals = set(goal_states)
+    deadline = None if seconds is None else time.perf_counter() + seconds
+    best_g = {initial_state: 0}
+    parents = {initial_state: None}
+    h = {initial_state: heuristic(initial_state)}
+    order = count()
+    open_list = [(weight * h[initial_state], next(order), 0, initial_state)]
+    closed = set()
+    incons = set()  # improved after being expanded in this iteration
+    goal, goal_cost = None, math.inf
+    reported = (math.inf, math.inf)
+    expanded = 0
+    while True:
+        while open_list and open_list[0][0] < goal_cost:
+            key, _, g, state = heappop(open_list)
+            if g > best_g[state] or state in closed:
+                continue  # stale entry
+            if state in goals:
+                goal, goal_cost = state, g
+                continue
+            if max_expansions is not None and expanded >= max_expansions or \
+                    deadline is not None and expanded % 256 == 0 and time.perf_counter() > deadline:
+                return
+            closed.add(state)
+            expanded += 1
+            for child in successor_fn(state):
+                child_g = g + cost_fn(state, child)
+                if child_g >= best_g.get(child, math.inf):
+                    continue
+                best_g[child] = child_g
+                parents[child] = state
+                if child in closed:
+                    incons.add(child)
+                else:
+                    if child not in h:
+                        h[child] = heuristic(child)
+                    heappush(open_list, (child_g + weight * h[child], next(order), child_g, child))
+
+        waiting = {state for key, _, g, state in open_list if g == best_g[state] and state not in closed} | incons
+        lower_bound = min((best_g[state] + h[state] for state in waiting), default=math.inf)
+        if goal is not None:
+            bound = max(1.0, min(weight, goal_cost / lower_bound) if lower_bound > 0 else weight)
+            if (goal_cost, bound) < reported:  # a cheaper path, or a tighter bound on the same one
+                reported = goal_cost, bound
+                yield path_to(parents, goal), goal_cost, bound, expanded
+        if weight <= 1.0 or not waiting:
+            return
+        weight = max(1.0, weight - step)
+        open_list = [(best_g[state] + weight * h[state], next(order), best_g[state], state) for state in waiting]
+        heapify(open_list)
+        closed = set()
+        incons = set()
+
+
+def run():
+    print('aStar.py, whose lookup table overestimates, so the bounds do not hold:')
+    costs = []
+    for path, cost, bound, expanded in ARA_STAR_SEARCH(ASTAR.successor_fn, astar_cost, ASTAR.lookup.get,
+                                                       ASTAR.INITIAL_STATE, ASTAR.GOAL_STATE):
+        if cost not in costs:  # a tighter bound on the same path says nothing here
+            costs.append(cost)
+            print('  {} cost {}, {} expanded'.format(path, cost, expanded))
+
+    puzzle = SlidingPuzzle(4)  # the Manhattan distance is admissible, so the bounds hold
+    initial_state = puzzle.scramble(60, seed=0)
+    unit_cost = lambda state, child: 1
+    for budget in (None, 0.5):
+        print('\n15-puzzle, 60 random moves, seed 0, {}:'.format('no budget' if budget is None else
+                                                                 '{}s budget'.format(budget)))
+        start = time.perf_counter()
+        for path, cost, bound, expanded in ARA_STAR_SEARCH(puzzle.__getitem__, unit_cost, puzzle.manhattan,
+                                                           initial_state, [puzzle.GOAL_STATE], seconds=budget):
+            print('  {:6.2f}s  {} moves, within {:.2f} x optimal, {} expanded'.format(
+                time.perf_counter() - start, cost, bound, expanded))
+
+
+if __name__ == '__main__':
+    run()
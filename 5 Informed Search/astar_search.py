@@ -0,0 +1,106 @@
+"""
+A* search engine
+
+Unlike aStar.py's TREE_SEARCH, this keeps the real path cost g of every
+state, an open list on a binary heap ordered by f = g + h (ties go to the
+lower h, then to the older entry), and a closed set. Entries that became
+stale when a cheaper path was found are skipped when popped (lazy
+deletion). If the heuristic is admissible but not consistent, a closed state
+can be reached again more cheaply; it is then reopened, so the returned
+path is still optimal.
+"""
+import math
+import random
+import time
+from heapq import heappop, heappush
+from itertools import count
+
+from problems import ASTAR, astar_cost, path_to
+from uniform_cost_search import UNIFORM_COST_SEARCH
+
+
+def A_STAR_SEARCH(successor_fn, cost_fn, heuristic, initial_state, goal_states):
+    '''
+    Return (cheapest path to any goal state or None, its cost, stats) where
+    stats counts expanded and generated nodes, reopened states and stale
+    heap entries, and the peak open list size.
+    '''
+    goals = set(goal_states)
+    best_g = {initial_state: 0}
+    parents = {initial_state: None}
+    order = count()
+    h = heuristic(initial_state)
+    open_list = [(h, h, next(order), 0, initial_state)]
+    closed = set()
+    stats = {'expanded': 0, 'generated': 1, 'reopened': 0, 'stale': 0, 'peak_open': 1}
+    while open_list:
+        f, h, _, g, state = heappop(open_list)
+        if g > best_g[state] or state in closed:
+            stats['stale'] += 1
+            continue
+        if state in goals:
+            return path_to(parents, state), g, stats
+        closed.add(state)
+        stats['expanded'] += 1
+        for child in successor_fn(state):
+            child_g = g + cost_fn(state, child)
+            if child_g >= best_g.get(child, math.inf):
+                continue
+            if child in closed:  # inconsistent heuristic: found a cheaper path to an expanded state
+                closed.remove(child)
+                stats['reopened'] += 1
+            best_g[child] = child_g
+            parents[child] = state
+            child_h = heuristic(child)
+            heappush(open_list, (child_g + child_h, child_h, next(order), child_g, child))
+            stats['generated'] += 1
+        stats['peak_open'] = max(stats['peak_open'], len(open_list))
+    return None, math.inf, stats
+
+
+def GRID_GRAPH(rows, cols, seed=0):
+    '''
+    Road-like test graph: points on a jittered rows x cols grid, each linked
+    to its 8 neighbours with the Euclidean distance as cost.
+    Return (successors {state: [child]}, cost {state: {child: cost}}, positions).
+    '''
+    rng = random.Random(seed)
+    positions = [(row + rng.uniform(-0.3, 0.3), col + rng.uniform(-0.3, 0.3))
+                 for row in range(rows) for col in range(cols)]
+    successors = {}
+    cost = {}
+    for state in range(rows * cols):
+        row, col = divmod(state, cols)
+        successors[state] = [r * cols + c for r in (row - 1, row, row + 1) for c in (col - 1, col, col + 1)
+                             if 0 <= r < rows and 0 <= c < cols and (r, c) != (row, col)]
+        cost[state] = {child: math.dist(positions[state], positions[child]) for child in successors[state]}
+    return successors, cost, positions
+
+
+def run(rows=100, cols=100):
+    path, cost, stats = A_STAR_SEARCH(ASTAR.successor_fn, astar_cost, ASTAR.lookup.get,
+                                      ASTAR.INITIAL_STATE, ASTAR.GOAL_STATE)
+    print('aStar.py: {} cost {}  {}'.format(path, cost, stats))
+    print('  uniform-cost optimum: cost {} (the lookup table overestimates,'
+          ' e.g. h(C) = 5 but C -> E -> G -> K costs 3)'.format(
+              UNIFORM_COST_SEARCH(ASTAR.successor_fn, astar_cost, ASTAR.INITIAL_STATE, ASTAR.GOAL_STATE)[1]))
+
+    successors, costs, positions = GRID_GRAPH(rows, cols)
+    start_state, goal = 0, rows * cols - 1
+    cost_fn = lambda state, child: costs[state][child]
+    euclidean = lambda state: math.dist(positions[state], positions[goal])
+    rng = random.Random(1)
+    noise = [rng.uniform(0.8, 1.0) for state in range(rows * cols)]
+    inconsistent = lambda state: euclidean(state) * noise[state]  # still admissible, no longer consistent
+
+    print('\n{}x{} grid graph, corner to corner:'.format(rows, cols))
+    for name, heuristic in [('h = 0 (uniform cost)', lambda state: 0),
+                            ('Euclidean', euclidean),
+                            ('Euclidean * noise', inconsistent)]:
+        start = time.perf_counter()
+        path, cost, stats = A_STAR_SEARCH(successors.__getitem__, cost_fn, heuristic, start_state, [goal])
+        print('  {:22s} cost {:.3f}, {:.2f}s  {}'.format(name, cost, time.perf_counter() - start, stats))
+
+
+if __name__ == '__main__':
+    run()
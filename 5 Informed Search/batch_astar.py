@@ -0,0 +1,183 @@
+"""
+Batch A* queries on one fixed graph with reusable search buffers
+
+A_STAR_SEARCH builds new g, parent and closed dicts for every query. Here
+every worker allocates flat g, parent and closed arrays over all states
+of a CSR graph once. A query only bumps a generation counter: an entry
+counts only if its stamp equals the current generation, so older entries
+are stale and the arrays never need clearing. Queries are split into
+chunks and spread over a process pool, one buffer set per worker.
+
+The heuristic is a parameter: a function of [goal] returning h(state),
+like LandmarkTable.heuristic from landmarks.py, which every worker gets
+once. It must be consistent. By default it is the straight-line distance
+from the graph's COORDS (consistent when edge costs are at least the
+distance, as on the road graphs from csr_graph.py), or h = 0 for graphs
+without coordinates.
+"""
+import math
+import os
+import random
+import tempfile
+import time
+from array import array
+from heapq import heappop, heappush
+from multiprocessing import Pool, cpu_count
+
+from astar_search import A_STAR_SEARCH
+from csr_graph import CSRGraph, LOAD_EDGE_LIST, WRITE_ROAD_GRAPH
+from landmarks import LandmarkTable
+from problems import ASTAR, astar_cost
+
+worker_graph = None  # (offsets, targets, weights) as lists, set once in every worker process
+worker_heuristic = None
+worker_buffers = None
+
+
+class SearchBuffers:  # Per-state arrays for one search at a time, reset by a new generation
+    def __init__(self, n):
+        self.G = array('d', [0.0]) * n
+        self.PARENT = array('q', [0]) * n
+        self.SEEN = array('q', [0]) * n  # G and PARENT hold this query's values where SEEN == generation
+        self.CLOSED = array('q', [0]) * n  # expanded in this query where CLOSED == generation
+        self.generation = 0
+
+
+def GRAPH_LISTS(graph):  # CSR arrays as Python lists, which index faster than NumPy scalars
+    return tuple(array.tolist() for array in (graph.OFFSETS, graph.TARGETS, graph.WEIGHTS))
+
+
+def STRAIGHT_LINE(graph):
+    '''
+    Return a heuristic like LandmarkTable.heuristic: for [goal], h(state) is
+    the straight-line distance between the two states' COORDS, or 0 if the
+    graph has no COORDS.
+    '''
+    if graph.COORDS is None:
+        return lambda goal_states: lambda state: 0.0
+    xs, ys = (column.tolist() for column in graph.COORDS.T)
+
+    def heuristic(goal_states):
+        (goal,) = goal_states
+        goal_x, goal_y = xs[goal], ys[goal]
+        return lambda state: math.hypot(xs[state] - goal_x, ys[state] - goal_y)
+    return heuristic
+
+
+def init_worker(graph, heuristic):
+    global worker_graph, worker_heuristic, worker_buffers
+    worker_graph = GRAPH_LISTS(graph)
+    worker_heuristic = STRAIGHT_LINE(graph) if heuristic is None else heuristic
+    worker_buffers = SearchBuffers(len(graph))
+
+
+def QUERY(graph, buffers, heuristic, initial_state, goal):
+    '''
+    A* from initial_state to goal, with heuristic([goal]) as h. Return
+    (path or None, cost, expanded).
+    '''
+    offsets, targets, weights = graph
+    g, parent, seen, closed = buffers.G, buffers.PARENT, buffers.SEEN, buffers.CLOSED
+    buffers.generation += 1
+    stamp = buffers.generation
+    h = heuristic([goal])
+    g[initial_state] = 0.0
+    parent[initial_state] = -1
+    seen[initial_state] = stamp
+    open_list = [(h(initial_state), 0.0, initial_state)]
+    expanded = 0
+    while open_list:
+        f, state_g, state = heappop(open_list)
+        if closed[state] == stamp or state_g > g[state]:
+            continue  # stale entry
+        if state == goal:
+            path = [state]
+            while parent[path[-1]] >= 0:
+                path.append(parent[path[-1]])
+            return path[::-1], state_g, expanded
+        closed[state] = stamp
+        expanded += 1
+        for edge in range(offsets[state], offsets[state + 1]):
+            child = targets[edge]
+            child_g = state_g + weights[edge]
+            if closed[child] != stamp and (seen[child] != stamp or child_g < g[child]):
+                seen[child] = stamp
+                g[child] = child_g
+                parent[child] = state
+                heappush(open_list, (child_g + h(child), child_g, child))
+    return None, math.inf, expanded
+
+
+def QUERY_CHUNK(queries):  # In a worker: [(path as array('q') or None, cost, expanded)] for [(start, goal)]
+    results = []
+    for initial_state, goal in queries:
+        path, cost, expanded = QUERY(worker_graph, worker_buffers, worker_heuristic, initial_state, goal)
+        results.append((None if path is None else array('q', path), cost, expanded))
+    return results
+
+
+def BATCH_A_STAR(graph, queries, heuristic=None, workers=None, chunk_size=32):
+    '''
+    Answer [(start, goal)] queries on graph. Return a list of (path, cost,
+    expanded) in query order. heuristic defaults to STRAIGHT_LINE(graph),
+    set up in each worker; one given here must pickle for spawned workers
+    (a LandmarkTable's heuristic does). workers=1 runs them in this process.
+    '''
+    chunks = [queries[i:i + chunk_size] for i in range(0, len(queries), chunk_size)]
+    if workers == 1:
+        init_worker(graph, heuristic)
+        return [result for chunk in chunks for result in QUERY_CHUNK(chunk)]
+    with Pool(workers or cpu_count(), initializer=init_worker, initargs=(graph, heuristic)) as pool:
+        return [result for results in pool.map(QUERY_CHUNK, chunks) for result in results]
+
+
+def run(rows=200, cols=200, queries=300):
+    graph = CSRGraph.from_script(ASTAR.STATE_SPACE, astar_cost, ASTAR.lookup)
+    pairs = [(graph.INDEX[ASTAR.INITIAL_STATE], goal) for goal in graph.ids(ASTAR.GOAL_STATE)]
+    for name, heuristic in [('no COORDS, h = 0', None),
+                            ('its lookup table (not admissible)', lambda goal_states: graph.HEURISTIC.tolist().__getitem__)]:
+        results = BATCH_A_STAR(graph, pairs, heuristic, workers=1)
+        print('aStar.py tables, {}: {}'.format(name, ', '.join('{} cost {} ({} expanded)'.format(
+            graph.states(path), cost, expanded) for path, cost, expanded in results)))
+
+    with tempfile.TemporaryDirectory() as directory:
+        edge_path, coords_path = os.path.join(directory, 'road.txt'), os.path.join(directory, 'road.xy')
+        WRITE_ROAD_GRAPH(edge_path, coords_path, rows, cols)
+        graph = LOAD_EDGE_LIST(edge_path, coords_path)
+    rng = random.Random(0)
+    pairs = [(rng.randrange(len(graph)), rng.randrange(len(graph))) for i in range(queries)]
+    print('\nRoad-like graph, {} states, {} edges, {} random queries, {} CPUs'.format(
+        len(graph), len(graph.TARGETS), queries, cpu_count()))
+
+    offsets, targets, weights = GRAPH_LISTS(graph)
+    successors = lambda state: targets[offsets[state]:offsets[state + 1]]
+    row = {}  # cost_fn is called right after successor_fn, so the costs of one row are enough
+
+    def cost_fn(state, child):
+        if row.get('state') != state:
+            row.clear()
+            row.update(zip(successors(state), weights[offsets[state]:offsets[state + 1]]), state=state)
+        return row[child]
+
+    straight_line = STRAIGHT_LINE(graph)
+    start = time.perf_counter()
+    expected = [A_STAR_SEARCH(successors, cost_fn, straight_line([goal]), initial_state, [goal])[1]
+                for initial_state, goal in pairs]
+    seconds = time.perf_counter() - start
+    print('  {:52s} {:7.1f} queries/s'.format('A_STAR_SEARCH, new dicts per query', queries / seconds))
+
+    table = LandmarkTable.build(graph, 4)
+    runs = [('straight line', None, workers) for workers in sorted({1, 2, cpu_count()})]
+    runs.append(('ALT, 4 landmarks', table.heuristic, 1))
+    for name, heuristic, workers in runs:
+        start = time.perf_counter()
+        results = BATCH_A_STAR(graph, pairs, heuristic, workers)
+        seconds = time.perf_counter() - start
+        assert all(math.isclose(cost, expected_cost) for (path, cost, expanded), expected_cost in zip(results, expected))
+        print('  {:52s} {:7.1f} queries/s, {} expanded'.format('BATCH_A_STAR, {}, {} worker{}'.format(
+            name, workers, 's' if workers > 1 else ' (in process)'), queries / seconds,
+            sum(expanded for path, cost, expanded in results)))
+
+
+if __name__ == '__main__':
+    run()
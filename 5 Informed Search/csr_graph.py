@@ -0,0 +1,246 @@
+"""
+Compressed sparse row (CSR) graphs for the informed search engines
+
+Greedy.py and aStar.py keep a graph as several dicts (STATE_SPACE, the
+heuristic table and the cost table). Here the states are ids 0 .. n - 1,
+and the edges of state i are TARGETS[OFFSETS[i]:OFFSETS[i + 1]] with their
+costs at the same positions in WEIGHTS. That is four NumPy arrays instead
+of one Python object per edge.
+
+Large graphs come as text edge lists, one "source target cost" per line.
+The text is parsed once and saved as .npy files, and later runs open those
+files memory-mapped until the text files change, so loading takes
+milliseconds and only the pages a search touches are read. A CSRGraph
+works as Greedy.py's STATE_SPACE and provides successor_fn, cost_fn and
+heuristics for A_STAR_SEARCH.
+"""
+import os
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+import numpy as np
+
+from astar_search import A_STAR_SEARCH
+from problems import ASTAR, GREEDY, astar_cost, greedy_cost
+
+ARRAYS = ('offsets', 'targets', 'weights', 'coords', 'names')
+
+
+class CSRGraph:  # States are ids 0 .. n - 1, NAMES maps them back to the script's states
+    def __init__(self, offsets, targets, weights, coords=None, names=None):
+        self.OFFSETS = offsets  # int64, n + 1 entries
+        self.TARGETS = targets  # int32, one per edge, sorted within each state's row
+        self.WEIGHTS = weights  # float64, one per edge
+        self.COORDS = coords  # float64 [n, 2] positions for geometric heuristics, or None
+        self.NAMES = names  # state of each id, or None when the ids are the states
+        self.INDEX = None if names is None else {name: i for i, name in enumerate(names)}
+        self.HEURISTIC = None  # float64 per id, used as Greedy.py's HEURISTIC_LOOKUP
+        self.row_state = None  # cost_fn caches the row of the state being expanded
+        self.row = None
+
+    @classmethod
+    def from_edges(cls, sources, targets, weights, n=None, coords=None, names=None):
+        '''
+        Build from parallel arrays of edges, in any order. Of repeated edges
+        only the cheapest is kept.
+        '''
+        if n is None:
+            n = int(max(sources.max(), targets.max())) + 1 if len(sources) else 0
+        order = np.lexsort((weights, targets, sources))
+        sources, targets, weights = sources[order], targets[order], weights[order]
+        keep = np.ones(len(sources), dtype=bool)
+        keep[1:] = (sources[1:] != sources[:-1]) | (targets[1:] != targets[:-1])
+        sources, targets, weights = sources[keep], targets[keep], weights[keep]
+        offsets = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(sources, minlength=n), out=offsets[1:])
+        return cls(offsets, targets.astype(np.int32), weights.astype(np.float64), coords, names)
+
+    @classmethod
+    def from_script(cls, state_space, cost_fn, heuristic=None):  # From a chapter script's dicts
+        names = list(state_space)
+        names.extend(child for children in state_space.values() for child in children if child not in state_space)
+        names = list(dict.fromkeys(names))
+        index = {name: i for i, name in enumerate(names)}
+        edges = [(index[state], index[child], cost_fn(state, child))
+                 for state, children in state_space.items() for child in children]
+        sources, targets, weights = (np.array(column) for column in zip(*edges))
+        graph = cls.from_edges(sources.astype(np.int64), targets.astype(np.int64), weights.astype(np.float64),
+                               len(names), names=names)
+        if heuristic is not None:
+            graph.HEURISTIC = np.array([heuristic[name] for name in names], dtype=np.float64)
+        return graph
+
+    def __len__(self):
+        return len(self.OFFSETS) - 1
+
+    def __getitem__(self, state):  # Successors, so the graph works as a STATE_SPACE
+        return self.TARGETS[self.OFFSETS[state]:self.OFFSETS[state + 1]].tolist()
+
+    def successor_fn(self, state):
+        return self[state]
+
+    def cost_fn(self, state, child):
+        if state != self.row_state:
+            start, end = self.OFFSETS[state], self.OFFSETS[state + 1]
+            self.row = dict(zip(self.TARGETS[start:end].tolist(), self.WEIGHTS[start:end].tolist()))
+            self.row_state = state
+        return self.row[child]
+
+    def euclidean_to(self, goal):  # Straight-line distance from every state to goal
+        return np.hypot(*(self.COORDS - self.COORDS[goal]).T)
+
+    def ids(self, states):
+        return [self.INDEX[state] for state in states]
+
+    def states(self, ids):
+        return list(ids) if self.NAMES is None else [self.NAMES[i] for i in ids]
+
+    def nbytes(self):
+        return sum(array.nbytes for array in (self.OFFSETS, self.TARGETS, self.WEIGHTS, self.COORDS)
+                   if array is not None)
+
+    def save(self, directory):
+        os.makedirs(directory, exist_ok=True)
+        for name, array in zip(ARRAYS, (self.OFFSETS, self.TARGETS, self.WEIGHTS, self.COORDS, self.NAMES)):
+            if array is not None:
+                np.save(os.path.join(directory, name + '.npy'), np.asarray(array))
+
+    @classmethod
+    def load(cls, directory):  # Arrays are memory-mapped, not read
+        arrays = {}
+        for name in ARRAYS:
+            path = os.path.join(directory, name + '.npy')
+            arrays[name] = np.load(path, mmap_mode='r') if os.path.exists(path) else None
+        names = None if arrays['names'] is None else arrays['names'].tolist()
+        return cls(arrays['offsets'], arrays['targets'], arrays['weights'], arrays['coords'], names)
+
+
+def READ_NUMBERS(path, columns):  # Whitespace separated numbers after any leading '#' lines
+    with open(path, 'rb') as f:
+        while True:
+            position = f.tell()
+            if not f.readline().startswith(b'#'):
+                break
+        f.seek(position)
+        return np.fromfile(f, sep=' ').reshape(-1, columns)
+
+
+def LOAD_EDGE_LIST(path, coords_path=None):
+    '''
+    Parse a text edge list ("source target cost" per line) and optionally
+    a file of "x y" node positions, one line per state id.
+    '''
+    edges = READ_NUMBERS(path, 3)
+    coords = None if coords_path is None else READ_NUMBERS(coords_path, 2)
+    return CSRGraph.from_edges(edges[:, 0].astype(np.int64), edges[:, 1].astype(np.int64), edges[:, 2],
+                               None if coords is None else len(coords), coords)
+
+
+def SOURCE_KEY(*paths):  # Changes whenever one of the source files is rewritten
+    return repr([(os.path.abspath(path), os.stat(path).st_size, os.stat(path).st_mtime_ns)
+                 for path in paths if path is not None])
+
+
+def CACHED_GRAPH(directory, path, coords_path=None):
+    '''
+    Memory-map the arrays saved from these source files, or parse the files
+    and save them if there are none or the files changed since.
+    '''
+    key = SOURCE_KEY(path, coords_path)
+    key_path = os.path.join(directory, 'source.txt')
+    if os.path.exists(key_path):
+        with open(key_path) as f:
+            if f.read() == key:
+                return CSRGraph.load(directory)
+    for name in ARRAYS:  # coords or names may be gone from the new graph
+        if os.path.exists(os.path.join(directory, name + '.npy')):
+            os.remove(os.path.join(directory, name + '.npy'))
+    LOAD_EDGE_LIST(path, coords_path).save(directory)
+    with open(key_path, 'w') as f:
+        f.write(key)
+    return CSRGraph.load(directory)
+
+
+@contextmanager
+def PLUG_INTO(script, graph, initial_state, goal_states):  # Make Greedy.py search the graph inside a with block
+    saved = script.STATE_SPACE, script.HEURISTIC_LOOKUP, script.INITIAL_STATE, script.GOAL_STATE
+    script.STATE_SPACE = graph
+    script.HEURISTIC_LOOKUP = graph.HEURISTIC
+    script.INITIAL_STATE = initial_state
+    script.GOAL_STATE = tuple(goal_states)
+    try:
+        yield script
+    finally:
+        script.STATE_SPACE, script.HEURISTIC_LOOKUP, script.INITIAL_STATE, script.GOAL_STATE = saved
+
+
+def WRITE_ROAD_GRAPH(path, coords_path, rows, cols, seed=0):
+    '''
+    Write a road-like test graph: a jittered rows x cols grid, each point
+    linked both ways to its 8 neighbours, cost = Euclidean distance.
+    '''
+    rng = np.random.default_rng(seed)
+    row, col = np.divmod(np.arange(rows * cols), cols)
+    coords = np.column_stack([row, col]) + rng.uniform(-0.3, 0.3, (rows * cols, 2))
+    sources, targets = [], []
+    for dr, dc in ((-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1)):
+        inside = (row + dr >= 0) & (row + dr < rows) & (col + dc >= 0) & (col + dc < cols)
+        sources.append(np.flatnonzero(inside))
+        targets.append(sources[-1] + dr * cols + dc)
+    sources, targets = np.concatenate(sources), np.concatenate(targets)
+    weights = np.hypot(*(coords[sources] - coords[targets]).T)
+    np.savetxt(path, np.column_stack([sources, targets, weights]), fmt=['%d', '%d', '%.6f'],
+               header='source target cost')
+    np.savetxt(coords_path, coords, fmt='%.6f')
+    return len(sources)
+
+
+def run(rows=360, cols=360):
+    expected = [node.STATE for node in GREEDY.TREE_SEARCH()[::-1]]
+    graph = CSRGraph.from_script(GREEDY.STATE_SPACE, greedy_cost, GREEDY.HEURISTIC_LOOKUP)
+    with PLUG_INTO(GREEDY, graph, graph.INDEX[GREEDY.INITIAL_STATE], graph.ids(GREEDY.GOAL_STATE)):
+        path = graph.states(node.STATE for node in GREEDY.TREE_SEARCH()[::-1])
+    print('Greedy.py from dicts: {}, from CSR: {}'.format(expected, path))
+
+    graph = CSRGraph.from_script(ASTAR.STATE_SPACE, astar_cost, ASTAR.lookup)
+    path, cost, stats = A_STAR_SEARCH(graph.successor_fn, graph.cost_fn, graph.HEURISTIC.tolist().__getitem__,
+                                      graph.INDEX[ASTAR.INITIAL_STATE], graph.ids(ASTAR.GOAL_STATE))
+    print('aStar.py tables as CSR: {} cost {}'.format(graph.states(path), cost))
+
+    with tempfile.TemporaryDirectory() as directory:
+        edge_path = os.path.join(directory, 'road.txt')
+        coords_path = os.path.join(directory, 'road.xy')
+        edges = WRITE_ROAD_GRAPH(edge_path, coords_path, rows, cols)
+        print('\nRoad-like graph: {} states, {} edges, {:.0f} MB of text'.format(
+            rows * cols, edges, os.path.getsize(edge_path) / 2 ** 20))
+
+        start = time.perf_counter()
+        graph = CACHED_GRAPH(os.path.join(directory, 'road'), edge_path, coords_path)
+        print('  parse text and save arrays: {:.2f}s'.format(time.perf_counter() - start))
+        start = time.perf_counter()
+        graph = CACHED_GRAPH(os.path.join(directory, 'road'), edge_path, coords_path)
+        print('  memory-map saved arrays:    {:.4f}s'.format(time.perf_counter() - start))
+
+        tracemalloc.start()
+        dicts = {state: dict(zip(graph[state], graph.WEIGHTS[graph.OFFSETS[state]:graph.OFFSETS[state + 1]].tolist()))
+                 for state in range(len(graph))}
+        dict_bytes = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        print('  CSR arrays {:.0f} MB, same edges as {{state: {{child: cost}}}} dicts {:.0f} MB'.format(
+            graph.nbytes() / 2 ** 20, dict_bytes / 2 ** 20))
+
+        goal = len(graph) - 1
+        heuristic = graph.euclidean_to(goal).tolist().__getitem__
+        for name, successor_fn, cost_fn in [('CSR', graph.successor_fn, graph.cost_fn),
+                                            ('dicts', dicts.__getitem__, lambda state, child: dicts[state][child])]:
+            start = time.perf_counter()
+            path, cost, stats = A_STAR_SEARCH(successor_fn, cost_fn, heuristic, 0, [goal])
+            print('  A* corner to corner on {:5s}: cost {:.3f}, {} expanded, {:.2f}s'.format(
+                name, cost, stats['expanded'], time.perf_counter() - start))
+        del graph, dicts  # release the memory maps before the directory is removed
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,75 @@
+"""
+Greedy best-first search: heap fringe versus linear scan
+
+Greedy.py used to find the best node by scanning the whole fringe list and
+then pop(bestIndex), O(n) per expansion. Its HeuristicFrontier is now a
+heapq with a generation counter, O(log n) per pop with the same tie
+breaking. This runs Greedy.TREE_SEARCH on large random trees with both
+fringes and checks that they return the same path.
+
+Measured on one core with Python 3.11 (random tree of n states):
+    n =  5000:  1022 expanded, peak fringe  212, scan  0.03s, heap 0.01s
+    n = 20000: 12086 expanded, peak fringe 1337, scan  2.77s, heap 0.07s
+    n = 50000: 28302 expanded, peak fringe 2635, scan 19.89s, heap 0.18s
+"""
+import random
+import time
+
+from problems import GREEDY
+
+
+class ScanFrontier(list):  # The old REMOVE_BEST: scan for the lowest heuristic, then pop(bestIndex)
+    def pop(self):
+        index = 0
+        bestIndex = 0
+        for node in self:
+            if index == 0:
+                best = GREEDY.HEURISTIC_LOOKUP[node.STATE]
+            if GREEDY.HEURISTIC_LOOKUP[node.STATE] < best:
+                best = GREEDY.HEURISTIC_LOOKUP[node.STATE]
+                bestIndex = index
+            index += 1
+        return list.pop(self, bestIndex)
+
+
+def RANDOM_PROBLEM(n, seed=0):
+    '''
+    Random tree of n states (each state hangs under a random earlier one)
+    with a random heuristic, and the last state as the only goal. Greedy
+    search wanders over much of the tree, so the fringe grows large.
+    '''
+    rng = random.Random(seed)
+    state_space = {state: [] for state in range(n)}
+    for state in range(1, n):
+        state_space[rng.randrange(state)].append(state)
+    heuristic = {state: rng.randrange(1, n) for state in range(n)}
+    heuristic[n - 1] = 0
+    return state_space, heuristic, (n - 1,)
+
+
+def run(sizes=(5000, 20000, 50000)):
+    saved = GREEDY.STATE_SPACE, GREEDY.HEURISTIC_LOOKUP, GREEDY.GOAL_STATE, GREEDY.INITIAL_STATE
+    try:
+        for n in sizes:
+            GREEDY.STATE_SPACE, GREEDY.HEURISTIC_LOOKUP, GREEDY.GOAL_STATE = RANDOM_PROBLEM(n)
+            GREEDY.INITIAL_STATE = 0
+
+            stats = GREEDY.SearchStats()
+            start = time.perf_counter()
+            heap_path = GREEDY.TREE_SEARCH(observer=stats)
+            heap_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            scan_path = GREEDY.TREE_SEARCH(fringe=ScanFrontier())
+            scan_time = time.perf_counter() - start
+
+            assert [node.STATE for node in heap_path] == [node.STATE for node in scan_path]
+            print('n = {}: {} expanded, peak fringe {}, scan {:.2f}s, heap {:.2f}s ({:.0f}x)'.format(
+                n, stats.counters['expanded'], stats.counters['peak_fringe'], scan_time, heap_time,
+                scan_time / heap_time))
+    finally:  # put Greedy.py's own problem back
+        GREEDY.STATE_SPACE, GREEDY.HEURISTIC_LOOKUP, GREEDY.GOAL_STATE, GREEDY.INITIAL_STATE = saved
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,264 @@
+"""
+Grid pathfinding on .map files, with Jump Point Search
+
+Reads the grid map benchmark format:
+
+    type octile
+    height 4
+    width 6
+    map
+    ......
+    .@@@..
+    ....@.
+    ......
+
+'.', 'G' and 'S' are passable, anything else ('@', 'O', 'T', 'W') is not.
+The grid is kept as one bytearray with a blocked border, and a state is
+the cell's index in it, so neighbours are index offsets and no bounds
+checks are needed. Moves go to the 8 neighbours at cost 1 or sqrt(2), never
+cutting a blocked corner, with the octile distance as heuristic, or to the
+4 neighbours at cost 1 with the Manhattan distance.
+
+JUMP_POINT_SEARCH is A* over 8-connected grids that expands only jump
+points: from each node it scans straight and diagonal lines and stops only
+where an obstacle makes a turn necessary, skipping the many symmetric
+paths plain A* expands one cell at a time.
+"""
+import math
+import os
+import random
+import tempfile
+import time
+from heapq import heappop, heappush
+from itertools import count
+
+from astar_search import A_STAR_SEARCH
+from problems import path_to
+
+SQRT2 = math.sqrt(2)
+PASSABLE = b'.GS'
+
+
+class GridMap:  # PASSABLE[state] is 1 for an open cell; the border around the map is blocked
+    def __init__(self, lines, diagonal=True):
+        self.HEIGHT = len(lines)
+        self.WIDTH = len(lines[0])
+        self.STRIDE = self.WIDTH + 2
+        self.DIAGONAL = diagonal
+        self.PASSABLE = bytearray(self.STRIDE * (self.HEIGHT + 2))
+        for row, line in enumerate(lines):
+            start = self.cell(row, 0)
+            self.PASSABLE[start:start + self.WIDTH] = bytes(char in PASSABLE for char in line.encode())
+        straight = [-self.STRIDE, self.STRIDE, -1, 1]
+        self.MOVES = [(move, 1, None) for move in straight]  # (offset, cost, corner cells that must be open)
+        if diagonal:
+            self.MOVES += [(dy + dx, SQRT2, (dy, dx)) for dy in straight[:2] for dx in straight[2:]]
+
+    def cell(self, row, col):
+        return (row + 1) * self.STRIDE + col + 1
+
+    def position(self, state):  # (row, col) on the map
+        row, col = divmod(state, self.STRIDE)
+        return row - 1, col - 1
+
+    def successor_fn(self, state):
+        passable = self.PASSABLE
+        return [state + move for move, cost, corner in self.MOVES
+                if passable[state + move] and (corner is None or passable[state + corner[0]] and passable[state + corner[1]])]
+
+    def cost_fn(self, state, child):
+        return 1 if abs(child - state) in (1, self.STRIDE) else SQRT2
+
+    def heuristic(self, goal):  # Octile distance for 8 moves, Manhattan for 4
+        goal_row, goal_col = divmod(goal, self.STRIDE)
+        stride = self.STRIDE
+        if not self.DIAGONAL:
+            return lambda state: abs(state // stride - goal_row) + abs(state % stride - goal_col)
+
+        def octile(state):
+            dy = abs(state // stride - goal_row)
+            dx = abs(state % stride - goal_col)
+            return max(dx, dy) + (SQRT2 - 1) * min(dx, dy)
+        return octile
+
+    def open_cells(self):
+        return [i for i, passable in enumerate(self.PASSABLE) if passable]
+
+
+def LOAD_MAP(path, diagonal=True):
+    with open(path) as f:
+        lines = f.read().splitlines()
+    header = {}
+    while lines and lines[0].strip() != 'map':
+        key, value = lines.pop(0).split()
+        header[key] = value
+    lines = lines[1:int(header['height']) + 1]
+    if len(lines) != int(header['height']) or any(len(line) != int(header['width']) for line in lines):
+        raise ValueError('{}: map does not match its height {} and width {}'.format(
+            path, header['height'], header['width']))
+    return GridMap(lines, diagonal)
+
+
+def WRITE_MAP(path, lines):
+    with open(path, 'w') as f:
+        f.write('type octile\nheight {}\nwidth {}\nmap\n'.format(len(lines), len(lines[0])))
+        f.write('\n'.join(lines) + '\n')
+
+
+def JUMP(passable, stride, state, dx, dy, goal):
+    '''
+    Scan from state in direction (dx, dy), dx in -1, 0, 1 and dy in -stride,
+    0, stride. Return the first jump point, or None if the scan hits a wall.
+    '''
+    if dx and dy:  # diagonal: stop where a straight scan from here finds a jump point
+        while True:
+            state += dx + dy
+            if not passable[state]:
+                return None
+            if state == goal or JUMP(passable, stride, state, dx, 0, goal) is not None \
+                    or JUMP(passable, stride, state, 0, dy, goal) is not None:
+                return state
+            if not (passable[state + dx] and passable[state + dy]):
+                return None  # the next diagonal step would cut a corner
+    move = dx + dy
+    side = 1 if dy else stride  # the cells beside a vertical scan are 1 away, beside a horizontal one a row away
+    while True:
+        state += move
+        if not passable[state]:
+            return None
+        if state == goal:
+            return state
+        if passable[state + side] and not passable[state - move + side] or \
+                passable[state - side] and not passable[state - move - side]:
+            return state  # forced neighbour: a wall beside the previous cell ends here
+
+
+def PRUNED_DIRECTIONS(grid, state, parent):  # [(dx, dy)] worth scanning from state when coming from parent
+    passable = grid.PASSABLE
+    stride = grid.STRIDE
+    if parent is None:
+        moves = [child - state for child in grid.successor_fn(state)]
+        return [(move - (move + 1) // stride * stride, (move + 1) // stride * stride) for move in moves]
+    row, col = divmod(state, stride)
+    parent_row, parent_col = divmod(parent, stride)
+    dx = (col > parent_col) - (col < parent_col)
+    dy = ((row > parent_row) - (row < parent_row)) * stride
+    directions = []
+    if dx and dy:
+        if passable[state + dy]:
+            directions.append((0, dy))
+        if passable[state + dx]:
+            directions.append((dx, 0))
+        if passable[state + dy] and passable[state + dx]:
+            directions.append((dx, dy))
+        return directions
+    if dx:
+        ahead, sides = passable[state + dx], [(0, -stride), (0, stride)]
+    else:
+        ahead, sides = passable[state + dy], [(-1, 0), (1, 0)]
+    for side_x, side_y in sides:
+        if passable[state + side_x + side_y]:
+            if ahead:
+                directions.append((dx or side_x, dy or side_y))
+            directions.append((side_x, side_y))
+    if ahead:
+        directions.append((dx, dy))
+    return directions
+
+
+def JUMP_POINT_SEARCH(grid, initial_state, goal):
+    '''
+    A* over jump points of an 8-connected grid. Return (every cell on the
+    cheapest path or None, its cost, stats) like A_STAR_SEARCH.
+    '''
+    passable = grid.PASSABLE
+    stride = grid.STRIDE
+    heuristic = grid.heuristic(goal)
+    best_g = {initial_state: 0}
+    parents = {initial_state: None}
+    order = count()
+    h = heuristic(initial_state)
+    open_list = [(h, h, next(order), 0, initial_state)]
+    closed = set()
+    stats = {'expanded': 0, 'generated': 1, 'stale': 0, 'peak_open': 1}
+    while open_list:
+        f, h, _, g, state = heappop(open_list)
+        if state in closed:
+            stats['stale'] += 1
+            continue
+        if state == goal:
+            return FILL_IN(path_to(parents, state), stride), g, stats
+        closed.add(state)
+        stats['expanded'] += 1
+        for dx, dy in PRUNED_DIRECTIONS(grid, state, parents[state]):
+            jump_point = JUMP(passable, stride, state, dx, dy, goal)
+            if jump_point is None or jump_point in closed:
+                continue
+            steps = (jump_point - state) // (dx + dy)
+            child_g = g + steps * (SQRT2 if dx and dy else 1)
+            if child_g < best_g.get(jump_point, math.inf):
+                best_g[jump_point] = child_g
+                parents[jump_point] = state
+                child_h = heuristic(jump_point)
+                heappush(open_list, (child_g + child_h, child_h, next(order), child_g, jump_point))
+                stats['generated'] += 1
+        stats['peak_open'] = max(stats['peak_open'], len(open_list))
+    return None, math.inf, stats
+
+
+def FILL_IN(jump_points, stride):  # The cells on the straight or diagonal lines between jump points
+    path = jump_points[:1]
+    for state in jump_points[1:]:
+        (row, col), (previous_row, previous_col) = divmod(state, stride), divmod(path[-1], stride)
+        row, col = row - previous_row, col - previous_col
+        move = ((row > 0) - (row < 0)) * stride + (col > 0) - (col < 0)
+        while path[-1] != state:
+            path.append(path[-1] + move)
+    return path
+
+
+def RANDOM_MAP(height, width, blocks, seed=0):  # Open map with random rectangular obstacles, as .map lines
+    rng = random.Random(seed)
+    grid = [['.'] * width for row in range(height)]
+    for i in range(blocks):
+        top, left = rng.randrange(height), rng.randrange(width)
+        for row in range(top, min(height, top + rng.randint(1, height // 16))):
+            for col in range(left, min(width, left + rng.randint(1, width // 16))):
+                grid[row][col] = '@'
+    return [''.join(row) for row in grid]
+
+
+def run(size=512, blocks=300, queries=5):
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'random.map')
+        WRITE_MAP(path, RANDOM_MAP(size, size, blocks))
+        grids = {diagonal: LOAD_MAP(path, diagonal) for diagonal in (True, False)}
+    print('{}x{} map with {} random blocks, {} bytes of grid'.format(size, size, blocks, len(grids[True].PASSABLE)))
+
+    rng = random.Random(1)
+    cells = grids[True].open_cells()
+    totals = {'A* octile': [0, 0.0], 'JPS octile': [0, 0.0], 'A* Manhattan': [0, 0.0]}
+    for query in range(queries):
+        start_state, goal = rng.choice(cells), rng.choice(cells)
+        results = {}
+        for name, diagonal, search in [
+                ('A* octile', True, lambda grid: A_STAR_SEARCH(grid.successor_fn, grid.cost_fn, grid.heuristic(goal),
+                                                                start_state, [goal])),
+                ('JPS octile', True, lambda grid: JUMP_POINT_SEARCH(grid, start_state, goal)),
+                ('A* Manhattan', False, lambda grid: A_STAR_SEARCH(grid.successor_fn, grid.cost_fn,
+                                                                   grid.heuristic(goal), start_state, [goal]))]:
+            start = time.perf_counter()
+            path, cost, stats = search(grids[diagonal])
+            totals[name][0] += stats['expanded']
+            totals[name][1] += time.perf_counter() - start
+            results[name] = cost
+        assert math.isclose(results['A* octile'], results['JPS octile'])
+        print('  {} -> {}: octile cost {:.2f}, 4-connected cost {}'.format(
+            grids[True].position(start_state), grids[True].position(goal), results['JPS octile'],
+            results['A* Manhattan']))
+    for name, (expanded, seconds) in totals.items():
+        print('{:13s} {:8d} nodes expanded, {:.2f}s for {} queries'.format(name, expanded, seconds, queries))
+
+
+if __name__ == '__main__':
+    run()
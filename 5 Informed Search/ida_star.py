@@ -0,0 +1,137 @@
+"""
+Iterative deepening A* (IDA*)
+
+A depth-first search cut off where f = g + h exceeds a bound. The bound
+starts at h(initial state), and each iteration raises it to the smallest f
+that went over the previous bound. Only the current path and one list of
+children per level are kept, so memory is O(depth) where A*'s open list
+holds every generated node. Children are tried in order of f: cheap
+children come first, and once one goes over the bound the rest of its
+siblings are skipped.
+"""
+import math
+import random
+import time
+
+from astar_search import A_STAR_SEARCH
+from problems import ASTAR, astar_cost
+
+
+def ORDERED_CHILDREN(successor_fn, cost_fn, heuristic, state, g):  # [(f, g, child)] sorted by f
+    children = []
+    for child in successor_fn(state):
+        child_g = g + cost_fn(state, child)
+        children.append((child_g + heuristic(child), child_g, child))
+    children.sort(key=lambda entry: entry[0])
+    return children
+
+
+def COST_LIMITED_SEARCH(successor_fn, cost_fn, heuristic, initial_state, goals, bound):
+    '''
+    Depth-first search through the states with f <= bound, without recursion.
+    Return (path to a goal or None, its cost, smallest f over the bound, expanded).
+    '''
+    path = [initial_state]
+    on_path = {initial_state}
+    stack = [iter(ORDERED_CHILDREN(successor_fn, cost_fn, heuristic, initial_state, 0))]
+    expanded = 1
+    next_bound = math.inf
+    while stack:
+        f, g, child = next(stack[-1], (None, None, None))
+        if f is not None and f > bound:
+            next_bound = min(next_bound, f)
+            f = None  # the siblings left are sorted after this one, so they are over the bound too
+        if f is None:
+            stack.pop()
+            on_path.discard(path.pop())
+            continue
+        if child in on_path:
+            continue
+        if child in goals:
+            return path + [child], g, next_bound, expanded
+        path.append(child)
+        on_path.add(child)
+        stack.append(iter(ORDERED_CHILDREN(successor_fn, cost_fn, heuristic, child, g)))
+        expanded += 1
+    return None, math.inf, next_bound, expanded
+
+
+def IDA_STAR_SEARCH(successor_fn, cost_fn, heuristic, initial_state, goal_states, max_iterations=1000):
+    '''
+    Return (path to a goal or None, its cost, stats) where stats has the
+    bound and the nodes expanded in each iteration.
+    '''
+    goals = set(goal_states)
+    stats = {'bounds': [], 'expanded': []}
+    if initial_state in goals:
+        return [initial_state], 0, stats
+    bound = heuristic(initial_state)
+    for iteration in range(max_iterations):
+        path, cost, next_bound, expanded = COST_LIMITED_SEARCH(successor_fn, cost_fn, heuristic,
+                                                               initial_state, goals, bound)
+        stats['bounds'].append(bound)
+        stats['expanded'].append(expanded)
+        if path is not None or next_bound == math.inf:
+            return path, cost, stats
+        bound = next_bound
+    return None, math.inf, stats
+
+
+class SlidingPuzzle:  # size x size tiles, a state is a tuple with 0 for the blank
+    def __init__(self, size):
+        self.SIZE = size
+        self.GOAL_STATE = tuple(range(1, size * size)) + (0,)
+        self.GOAL_POSITION = {tile: divmod(i, size) for i, tile in enumerate(self.GOAL_STATE)}
+
+    def __getitem__(self, state):  # Successors: slide a neighbouring tile into the blank
+        blank = state.index(0)
+        row, col = divmod(blank, self.SIZE)
+        successors = []
+        for r, c in ((row - 1, col), (row + 1, col), (row, col - 1), (row, col + 1)):
+            if 0 <= r < self.SIZE and 0 <= c < self.SIZE:
+                tiles = list(state)
+                tiles[blank], tiles[r * self.SIZE + c] = tiles[r * self.SIZE + c], 0
+                successors.append(tuple(tiles))
+        return successors
+
+    def manhattan(self, state):
+        distance = 0
+        for i, tile in enumerate(state):
+            if tile:
+                row, col = self.GOAL_POSITION[tile]
+                distance += abs(row - i // self.SIZE) + abs(col - i % self.SIZE)
+        return distance
+
+    def scramble(self, moves, seed=0):  # Random walk from the goal, never undoing the last move
+        rng = random.Random(seed)
+        previous, state = None, self.GOAL_STATE
+        for i in range(moves):
+            previous, state = state, rng.choice([child for child in self[state] if child != previous])
+        return state
+
+
+def run():
+    path, cost, stats = IDA_STAR_SEARCH(ASTAR.successor_fn, astar_cost, ASTAR.lookup.get,
+                                        ASTAR.INITIAL_STATE, ASTAR.GOAL_STATE)
+    print('aStar.py: {} cost {}  {}'.format(path, cost, stats))
+
+    unit_cost = lambda state, child: 1
+    for size, moves, seeds in [(3, 200, range(3)), (4, 60, (1, 2))]:
+        puzzle = SlidingPuzzle(size)
+        for seed in seeds:
+            initial_state = puzzle.scramble(moves, seed)
+            print('\n{}-puzzle, {} random moves, seed {}:'.format(size * size - 1, moves, seed))
+            start = time.perf_counter()
+            path, cost, stats = IDA_STAR_SEARCH(puzzle.__getitem__, unit_cost, puzzle.manhattan,
+                                                initial_state, [puzzle.GOAL_STATE])
+            print('  IDA*: {} moves, {:.2f}s, {} iterations, {} nodes expanded, at most {} states kept'.format(
+                cost, time.perf_counter() - start, len(stats['bounds']), sum(stats['expanded']), cost + 1))
+            start = time.perf_counter()
+            path, cost, stats = A_STAR_SEARCH(puzzle.__getitem__, unit_cost, puzzle.manhattan,
+                                              initial_state, [puzzle.GOAL_STATE])
+            print('  A*:   {} moves, {:.2f}s, {} nodes expanded, {} states kept (g and parent maps)'.format(
+                cost, time.perf_counter() - start, stats['expanded'], stats['generated']))
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,195 @@
+"""
+Landmark (ALT) heuristics for A*
+
+A graph without hand-typed heuristics like aStar.py's lookup still gets
+an admissible one from landmarks. Pick K states far apart, run Dijkstra
+from each of them (and, on the reversed graph, to each), and keep the
+distances in K x N float32 tables. By the triangle inequality, for every
+landmark L
+
+    d(v, t) >= d(L, t) - d(L, v)    and    d(v, t) >= d(v, L) - d(t, L)
+
+so the largest of these lower bounds is an admissible and consistent
+heuristic for reaching t. The tables are saved as .npy files with a hash
+of the graph and memory-mapped back, so they are built once per graph.
+"""
+import hashlib
+import math
+import os
+import random
+import tempfile
+import time
+from heapq import heappop, heappush
+
+import numpy as np
+
+from astar_search import A_STAR_SEARCH
+from csr_graph import CSRGraph, WRITE_ROAD_GRAPH, LOAD_EDGE_LIST
+from problems import ASTAR, astar_cost
+
+
+def REVERSED(graph):  # The same states with every edge turned around
+    sources = np.repeat(np.arange(len(graph)), np.diff(graph.OFFSETS))
+    return CSRGraph.from_edges(np.asarray(graph.TARGETS, dtype=np.int64), sources, np.asarray(graph.WEIGHTS),
+                               len(graph))
+
+
+def DIJKSTRA(offsets, targets, weights, source):
+    '''
+    Cost of the cheapest path from source to every state (inf if there is
+    none), over CSR rows given as Python lists.
+    '''
+    distance = [math.inf] * (len(offsets) - 1)
+    distance[source] = 0.0
+    heap = [(0.0, source)]
+    while heap:
+        d, state = heappop(heap)
+        if d > distance[state]:
+            continue  # stale entry
+        for edge in range(offsets[state], offsets[state + 1]):
+            child = targets[edge]
+            if d + weights[edge] < distance[child]:
+                distance[child] = d + weights[edge]
+                heappush(heap, (d + weights[edge], child))
+    return np.array(distance)
+
+
+class LandmarkTable:  # FROM[k, v] = d(landmark k, v), TO[k, v] = d(v, landmark k)
+    def __init__(self, landmarks, from_landmark, to_landmark, slack):
+        self.LANDMARKS = landmarks  # int32, K state ids
+        self.FROM = from_landmark  # float32 [K, N]
+        self.TO = to_landmark  # float32 [K, N]
+        self.SLACK = slack  # taken off every bound, see build
+
+    @classmethod
+    def build(cls, graph, k, seed=0):
+        '''
+        Farthest-point selection: start from the state farthest from a random
+        one, then keep adding the state farthest from every landmark so far
+        (in either direction; states cut off from all of them come first).
+        '''
+        forward = [array.tolist() for array in (graph.OFFSETS, graph.TARGETS, graph.WEIGHTS)]
+        reverse = REVERSED(graph)
+        backward = [array.tolist() for array in (reverse.OFFSETS, reverse.TARGETS, reverse.WEIGHTS)]
+        nearest = DIJKSTRA(*forward, random.Random(seed).randrange(len(graph)))  # to the closest landmark so far
+        landmarks, from_rows, to_rows = [], [], []
+        for i in range(k):
+            landmark = int(np.argmax(nearest))
+            landmarks.append(landmark)
+            from_rows.append(DIJKSTRA(*forward, landmark))
+            to_rows.append(DIJKSTRA(*backward, landmark))
+            row = np.minimum(from_rows[-1], to_rows[-1])  # inf only if not connected either way
+            nearest = row if i == 0 else np.minimum(nearest, row)
+        from_table = np.array(from_rows, dtype=np.float32)
+        # float32 keeps about 7 digits; shave that rounding off so the heuristic stays admissible
+        slack = 4 * float(np.finfo(np.float32).eps) * float(from_table[np.isfinite(from_table)].max(initial=0))
+        return cls(np.array(landmarks, dtype=np.int32), from_table, np.array(to_rows, dtype=np.float32), slack)
+
+    def heuristic(self, goal_states):
+        '''
+        Return h(state) for reaching the nearest goal. The goals' columns are
+        read once here, and h reads only the K entries of each state it is
+        asked about.
+        '''
+        from_table, to_table, slack = self.FROM, self.TO, self.SLACK
+        goals = [(from_table[:, goal].tolist(), to_table[:, goal].tolist()) for goal in goal_states]
+
+        def h(state):
+            from_state, to_state = from_table[:, state].tolist(), to_table[:, state].tolist()
+            best = math.inf
+            for from_goal, to_goal in goals:
+                bound = 0.0  # inf - inf is nan where a landmark reaches neither state, and nan > bound is False
+                for goal_from, state_from, state_to, goal_to in zip(from_goal, from_state, to_state, to_goal):
+                    bound = max(bound, goal_from - state_from, state_to - goal_to)
+                best = min(best, bound)
+            return max(best - slack, 0.0)
+        return h
+
+    def save(self, directory):
+        os.makedirs(directory, exist_ok=True)
+        for name, array in (('landmarks', self.LANDMARKS), ('from', self.FROM), ('to', self.TO),
+                            ('slack', np.float64(self.SLACK))):
+            np.save(os.path.join(directory, name + '.npy'), array)
+
+    @classmethod
+    def load(cls, directory):  # Tables are memory-mapped, not read
+        landmarks, from_landmark, to_landmark = (np.load(os.path.join(directory, name + '.npy'), mmap_mode='r')
+                                                 for name in ('landmarks', 'from', 'to'))
+        return cls(landmarks, from_landmark, to_landmark, float(np.load(os.path.join(directory, 'slack.npy'))))
+
+
+def GRAPH_HASH(graph):  # Changes with any edge or cost of the graph
+    digest = hashlib.sha256()
+    for array in (graph.OFFSETS, graph.TARGETS, graph.WEIGHTS):
+        digest.update(np.ascontiguousarray(array).tobytes())
+    return digest.hexdigest()
+
+
+def LANDMARK_TABLE(directory, graph, k):
+    '''
+    Memory-map the table saved for this graph, or build and save one if
+    there is none, it has a different K, or the graph's edges or costs
+    changed since (stale distances would not be admissible).
+    '''
+    graph_hash = GRAPH_HASH(graph)
+    hash_path = os.path.join(directory, 'graph_hash.txt')
+    if os.path.exists(hash_path):
+        with open(hash_path) as f:
+            saved_hash = f.read()
+        table = LandmarkTable.load(directory)
+        if saved_hash == graph_hash and table.FROM.shape == (k, len(graph)):
+            return table
+    LandmarkTable.build(graph, k).save(directory)
+    with open(hash_path, 'w') as f:
+        f.write(graph_hash)
+    return LandmarkTable.load(directory)
+
+
+def run(rows=200, cols=200, queries=20):
+    graph = CSRGraph.from_script(ASTAR.STATE_SPACE, astar_cost)
+    table = LandmarkTable.build(graph, 3)
+    alt = table.heuristic(graph.ids(ASTAR.GOAL_STATE))
+    print('aStar.py landmarks {}:'.format(graph.states(table.LANDMARKS)))
+    print('  lookup: {}'.format({state: ASTAR.lookup[state] for state in graph.NAMES}))
+    print('  ALT:    {}'.format({state: round(alt(i), 3) for i, state in enumerate(graph.NAMES)}))
+
+    with tempfile.TemporaryDirectory() as directory:
+        edge_path, coords_path = os.path.join(directory, 'road.txt'), os.path.join(directory, 'road.xy')
+        WRITE_ROAD_GRAPH(edge_path, coords_path, rows, cols)
+        road = LOAD_EDGE_LIST(edge_path, coords_path)
+        congestion = np.random.default_rng(0).uniform(1, 3, len(road.WEIGHTS))  # costs >= straight-line distance
+        graph = CSRGraph(road.OFFSETS, road.TARGETS, road.WEIGHTS * congestion, road.COORDS)
+        print('\nRoad-like graph, {} states, {} edges, costs 1-3x the distance:'.format(len(graph), len(graph.TARGETS)))
+
+        rng = random.Random(1)
+        pairs = [(rng.randrange(len(graph)), rng.randrange(len(graph))) for i in range(queries)]
+        heuristics = [('h = 0', lambda goal: lambda state: 0),
+                      ('Euclidean', lambda goal: graph.euclidean_to(goal).tolist().__getitem__)]
+        for k in (4, 16):
+            start = time.perf_counter()
+            table = LANDMARK_TABLE(os.path.join(directory, 'alt{}'.format(k)), graph, k)
+            built = time.perf_counter() - start
+            start = time.perf_counter()
+            table = LANDMARK_TABLE(os.path.join(directory, 'alt{}'.format(k)), graph, k)
+            print('  {} landmarks: built in {:.2f}s, {:.1f} MB, memory-mapped again in {:.4f}s'.format(
+                k, built, (table.FROM.nbytes + table.TO.nbytes) / 2 ** 20, time.perf_counter() - start))
+            heuristics.append(('ALT, {} landmarks'.format(k), lambda goal, table=table: table.heuristic([goal])))
+
+        optimum = None
+        for name, make_heuristic in heuristics:
+            expanded, costs = 0, []
+            start = time.perf_counter()
+            for initial_state, goal in pairs:
+                path, cost, stats = A_STAR_SEARCH(graph.successor_fn, graph.cost_fn, make_heuristic(goal),
+                                                  initial_state, [goal])
+                expanded += stats['expanded']
+                costs.append(cost)
+            optimum = optimum or costs
+            assert all(math.isclose(a, b) for a, b in zip(costs, optimum))
+            print('  {:20s} {:8d} nodes expanded, {:.2f}s for {} queries'.format(
+                name, expanded, time.perf_counter() - start, queries))
+        del table, heuristics  # release the memory maps before the directory is removed
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,159 @@
+"""
+Shortest path oracle for fixed explicit state spaces
+
+Instead of running a full search for every path request over the same
+STATE_SPACE dict, PathOracle runs Dijkstra once per target (or once from a
+goal set) over the reversed graph and stores a next-hop table in NumPy
+arrays. A path query then just follows next hops, O(path length).
+
+Tables are saved with a hash of the state space and costs, and load()
+refuses a table whose hash no longer matches the graph.
+"""
+import hashlib
+import os
+import tempfile
+from heapq import heappop, heappush
+
+import numpy as np
+
+from problems import ASTAR, GREEDY, LETTERS, astar_cost, greedy_cost
+
+
+def unit_cost(state, child):
+    return 1
+
+
+def GRAPH_HASH(state_space, cost_fn=unit_cost, goal_states=None):  # Changes with any edge, cost or goal
+    edges = sorted((repr(state), repr(child), repr(cost_fn(state, child)))
+                   for state, children in state_space.items() for child in children)
+    goals = None if goal_states is None else sorted(repr(goal) for goal in goal_states)
+    return hashlib.sha256(repr((edges, goals)).encode()).hexdigest()
+
+
+class PathOracle:  # next_hop[s, t]: index of the next state on a cheapest path from s to target t
+    def __init__(self, states, next_hop, distance, graph_hash, targets):
+        self.STATES = list(states)
+        self.INDEX = {state: i for i, state in enumerate(self.STATES)}
+        self.NEXT_HOP = next_hop  # int32 [state, target], -1 if unreachable
+        self.DISTANCE = distance  # float64 [state, target], inf if unreachable
+        self.GRAPH_HASH = graph_hash
+        self.TARGETS = list(targets)  # target column -> target state; None is "any goal"
+        self.TARGET_INDEX = {target: i for i, target in enumerate(self.TARGETS)}
+
+    @classmethod
+    def build(cls, state_space, cost_fn=unit_cost, goal_states=None):
+        '''
+        With goal_states=None, build a table for every pair of states.
+        Otherwise build a single column to the nearest of the goal states,
+        queried with target None.
+        '''
+        states = list(state_space)
+        for children in state_space.values():
+            states.extend(child for child in children if child not in state_space)
+        states = list(dict.fromkeys(states))
+        index = {state: i for i, state in enumerate(states)}
+
+        reverse = [[] for state in states]  # reverse[child] = [(parent, cost)]
+        for state, children in state_space.items():
+            for child in children:
+                reverse[index[child]].append((index[state], cost_fn(state, child)))
+
+        sources = [[index[target]] for target in states] if goal_states is None \
+            else [[index[goal] for goal in goal_states]]
+        next_hop = np.full((len(states), len(sources)), -1, dtype=np.int32)
+        distance = np.full((len(states), len(sources)), np.inf)
+        for column, targets in enumerate(sources):
+            DIJKSTRA_TO(reverse, targets, next_hop[:, column], distance[:, column])
+        return cls(states, next_hop, distance, GRAPH_HASH(state_space, cost_fn, goal_states),
+                   states if goal_states is None else [None])
+
+    def path(self, start, target=None):  # States from start to target, None if unreachable
+        column = self.TARGET_INDEX[target]
+        node = self.INDEX[start]
+        if self.NEXT_HOP[node, column] < 0:
+            return None
+        path = [start]
+        while self.NEXT_HOP[node, column] != node:
+            node = self.NEXT_HOP[node, column]
+            path.append(self.STATES[node])
+        return path
+
+    def cost(self, start, target=None):
+        return float(self.DISTANCE[self.INDEX[start], self.TARGET_INDEX[target]])
+
+    def save(self, path):  # Through a file object, so np.savez does not append '.npz' to the path
+        with open(path, 'wb') as f:
+            np.savez(f, states=np.array([repr(state) for state in self.STATES]),
+                     targets=np.array([repr(target) for target in self.TARGETS]),
+                     next_hop=self.NEXT_HOP, distance=self.DISTANCE, graph_hash=self.GRAPH_HASH)
+
+    @classmethod
+    def load(cls, path, state_space, cost_fn=unit_cost, goal_states=None):
+        '''
+        Load a saved table, or return None if it was built for a different
+        state space, different costs or different goal states.
+        '''
+        with np.load(path) as data:
+            if str(data['graph_hash']) != GRAPH_HASH(state_space, cost_fn, goal_states):
+                return None
+            by_repr = {repr(state): state for state in state_space}
+            for children in state_space.values():
+                by_repr.update((repr(child), child) for child in children)
+            by_repr['None'] = None
+            return cls([by_repr[state] for state in data['states']], data['next_hop'], data['distance'],
+                       str(data['graph_hash']), [by_repr[target] for target in data['targets']])
+
+
+def DIJKSTRA_TO(reverse, targets, next_hop, distance):
+    '''
+    Cheapest paths from every state to the nearest target, searching the
+    reversed edges. Fills next_hop (the parent in the reversed search tree
+    is the next hop forward) and distance in place.
+    '''
+    heap = []
+    for target in targets:
+        distance[target] = 0
+        next_hop[target] = target
+        heap.append((0, target))
+    while heap:
+        d, node = heappop(heap)
+        if d > distance[node]:
+            continue  # stale entry
+        for parent, cost in reverse[node]:
+            if d + cost < distance[parent]:
+                distance[parent] = d + cost
+                next_hop[parent] = node
+                heappush(heap, (d + cost, parent))
+
+
+def ORACLE(state_space, cost_fn, path, goal_states=None):  # Load the cached table, or build and save it
+    if os.path.exists(path):
+        oracle = PathOracle.load(path, state_space, cost_fn, goal_states)
+        if oracle is not None:
+            return oracle
+    oracle = PathOracle.build(state_space, cost_fn, goal_states)
+    oracle.save(path)
+    return oracle
+
+
+def run():
+    with tempfile.TemporaryDirectory() as directory:
+        letters = ORACLE(LETTERS.STATE_SPACE, unit_cost, os.path.join(directory, 'letters.npz'))
+        print('Letters A -> J:', letters.path('A', 'J'))
+
+        greedy = ORACLE(GREEDY.STATE_SPACE, greedy_cost, os.path.join(directory, 'greedy.npz'),
+                        GREEDY.GOAL_STATE)
+        print('Greedy.py  A -> goal: {} cost {}'.format(greedy.path('A'), greedy.cost('A')))
+
+        path = os.path.join(directory, 'astar.npz')
+        astar = ORACLE(ASTAR.STATE_SPACE, astar_cost, path)
+        print('aStar.py   A -> K: {} cost {}, A -> L: {} cost {}'.format(
+            astar.path('A', 'K'), astar.cost('A', 'K'), astar.path('A', 'L'), astar.cost('A', 'L')))
+        print('Cached table still valid:', PathOracle.load(path, ASTAR.STATE_SPACE, astar_cost) is not None)
+        changed = dict(ASTAR.STATE_SPACE, J=['L'])
+        changed_cost = lambda state, child: 1 if state == 'J' else astar_cost(state, child)
+        print('Valid after adding edge J -> L:', PathOracle.load(path, changed, changed_cost) is not None)
+
+
+if __name__ == '__main__':
+    run()
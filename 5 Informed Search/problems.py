@@ -0,0 +1,44 @@
+"""
+Example problems from the chapter scripts
+
+The Exercise and Homework folders are not packages, so the search engines
+in this folder load Greedy.py and aStar.py (and Letters.py from the
+uninformed search chapter) by path to run on the same dicts. path_to is
+shared by the engines.
+"""
+import importlib.util
+import os
+import sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def load(relative_path):  # Import a script by its path relative to this folder
+    name = os.path.splitext(os.path.basename(relative_path))[0]
+    if name not in sys.modules:
+        spec = importlib.util.spec_from_file_location(name, os.path.join(HERE, relative_path))
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[name] = module
+        spec.loader.exec_module(module)
+    return sys.modules[name]
+
+
+GREEDY = load(os.path.join('Exercise', 'Greedy.py'))
+ASTAR = load(os.path.join('Homework', 'aStar.py'))
+LETTERS = load(os.path.join('..', '4 Uninformed Search', 'Exercises', 'Letters.py'))
+
+
+def greedy_cost(state, child):  # Greedy.py keys its costs by the two state names, e.g. 'AB'
+    return GREEDY.COST_LOOKUP[state + child]
+
+
+def astar_cost(state, child):
+    return ASTAR.cost_lookup[state][child]
+
+
+def path_to(parents, state):  # States from the search root to state, following a {state: parent} map
+    path = []
+    while state is not None:
+        path.append(state)
+        state = parents[state]
+    return path[::-1]
@@ -0,0 +1,68 @@
+"""
+Uniform-cost search (Dijkstra) over the cost tables of Greedy.py and aStar.py
+
+The fringe is a binary heap of (g, order, state). When a cheaper path to a
+state is found the new entry is pushed and the old one is left in the heap;
+it is skipped when popped because its g is worse than the best-g map
+(lazy deletion). The first goal popped is the cheapest one.
+"""
+import random
+import time
+from heapq import heappop, heappush
+from itertools import count
+
+from problems import ASTAR, GREEDY, astar_cost, greedy_cost, path_to
+
+
+def UNIFORM_COST_SEARCH(successor_fn, cost_fn, initial_state, goal_states):
+    '''
+    Return (cheapest path to any goal state or None, its cost, stats) where
+    stats counts expanded and generated nodes, stale heap entries skipped and
+    the peak fringe size.
+    '''
+    goals = set(goal_states)
+    best_g = {initial_state: 0}
+    parents = {initial_state: None}
+    order = count()  # ties are popped in insertion order
+    fringe = [(0, next(order), initial_state)]
+    closed = set()
+    stats = {'expanded': 0, 'generated': 1, 'stale': 0, 'peak_fringe': 1}
+    while fringe:
+        g, _, state = heappop(fringe)
+        if state in closed:
+            stats['stale'] += 1
+            continue
+        if state in goals:
+            return path_to(parents, state), g, stats
+        closed.add(state)
+        stats['expanded'] += 1
+        for child in successor_fn(state):
+            child_g = g + cost_fn(state, child)
+            if child not in closed and child_g < best_g.get(child, float('inf')):
+                best_g[child] = child_g
+                parents[child] = state
+                heappush(fringe, (child_g, next(order), child))
+                stats['generated'] += 1
+        stats['peak_fringe'] = max(stats['peak_fringe'], len(fringe))
+    return None, float('inf'), stats
+
+
+def random_weighted_graph(n, branching, seed=0):  # {state: {child: cost}}
+    rng = random.Random(seed)
+    return {state: {rng.randrange(n): rng.randint(1, 100) for i in range(branching)} for state in range(n)}
+
+
+def run():
+    for name, script, cost_fn in [('Greedy.py', GREEDY, greedy_cost), ('aStar.py', ASTAR, astar_cost)]:
+        path, cost, stats = UNIFORM_COST_SEARCH(script.successor_fn, cost_fn, script.INITIAL_STATE, script.GOAL_STATE)
+        print('{:10s} {} cost {}  {}'.format(name, path, cost, stats))
+
+    graph = random_weighted_graph(200000, 4)
+    start = time.perf_counter()
+    path, cost, stats = UNIFORM_COST_SEARCH(graph.__getitem__, lambda state, child: graph[state][child], 0, [1])
+    print('Random graph, 200000 states: {} steps, cost {}, {:.2f}s  {}'.format(
+        len(path) - 1, cost, time.perf_counter() - start, stats))
+
+
+if __name__ == '__main__':
+    run()